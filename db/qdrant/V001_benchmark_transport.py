@@ -0,0 +1,128 @@
+"""
+Compare REST and gRPC transport for the V001 collection copy.
+
+Runs against a local Qdrant stand-in (e.g. `docker run -p 6333:6333 -p 6334:6334 qdrant/qdrant`)
+configured with the same variables as V001. For each transport it upserts and
+scrolls synthetic points at `--batch-size` and measures points/s, then doubles
+the upsert batch size until the request is rejected as too large.
+
+Usage:
+    python V001_benchmark_transport.py [--points N] [--dim N] [--batch-size N] [--max-batch-size N]
+"""
+import argparse
+import logging
+import time
+import uuid
+
+import numpy as np
+from qdrant_client.http import models as rest
+
+from V001_collection_names import get_qdrant_client, is_payload_too_large
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+def make_points(vectors):
+    return [
+        rest.PointStruct(id=str(uuid.uuid4()), vector=vector.tolist(), payload={"text": "benchmark", "date": 0.0})
+        for vector in vectors
+    ]
+
+
+def benchmark_transport(prefer_grpc, vectors, batch_size, max_batch_size):
+    transport = "grpc" if prefer_grpc else "rest"
+    client = get_qdrant_client(prefer_grpc=prefer_grpc)
+    collection_name = f"benchmark_transport_{transport}"
+    if client.collection_exists(collection_name):
+        client.delete_collection(collection_name)
+    client.create_collection(
+        collection_name=collection_name,
+        vectors_config=rest.VectorParams(size=vectors.shape[1], distance=rest.Distance.COSINE),
+        optimizers_config=rest.OptimizersConfigDiff(indexing_threshold=0),
+    )
+
+    try:
+        points = make_points(vectors)
+
+        start = time.perf_counter()
+        for i in range(0, len(points), batch_size):
+            client.upsert(collection_name=collection_name, points=points[i:i + batch_size], wait=True)
+        upsert_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        scrolled = 0
+        next_offset = None
+        while True:
+            records, next_offset = client.scroll(
+                collection_name=collection_name,
+                limit=batch_size,
+                offset=next_offset,
+                with_payload=True,
+                with_vectors=True,
+            )
+            scrolled += len(records)
+            if next_offset is None:
+                break
+        scroll_elapsed = time.perf_counter() - start
+
+        # Double the upsert batch until the server rejects it as too large
+        max_accepted = 0
+        size = batch_size
+        while size <= max_batch_size:
+            batch = make_points(vectors[np.arange(size) % len(vectors)])
+            try:
+                client.upsert(collection_name=collection_name, points=batch, wait=True)
+            except Exception as e:
+                if is_payload_too_large(e):
+                    break
+                raise
+            max_accepted = size
+            size *= 2
+    finally:
+        client.delete_collection(collection_name)
+        client.close()
+
+    return {
+        "transport": transport,
+        "upsert_points_per_s": len(points) / upsert_elapsed,
+        "scroll_points_per_s": scrolled / scroll_elapsed,
+        "max_batch_size": max_accepted,
+        # Never rejected: the real limit is above --max-batch-size
+        "max_batch_size_capped": size > max_batch_size,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare REST and gRPC throughput and maximum batch size on a local Qdrant"
+    )
+    parser.add_argument("--points", type=int, default=5000, help="Points upserted and scrolled per transport")
+    parser.add_argument("--dim", type=int, default=1024, help="Vector dimension")
+    parser.add_argument("--batch-size", type=int, default=32, help="Batch size for the throughput runs")
+    parser.add_argument("--max-batch-size", type=int, default=4096, help="Largest batch size probed")
+    args = parser.parse_args()
+
+    vectors = np.random.default_rng(0).random((args.points, args.dim), dtype=np.float32)
+
+    results = [
+        benchmark_transport(prefer_grpc, vectors, args.batch_size, args.max_batch_size)
+        for prefer_grpc in (False, True)
+    ]
+
+    logger.info("=" * 60)
+    logger.info(f"TRANSPORT BENCHMARK ({args.points} points, dim={args.dim}, batch={args.batch_size})")
+    logger.info("=" * 60)
+    for result in results:
+        cap = "+" if result["max_batch_size_capped"] else ""
+        logger.info(
+            f"{result['transport']:<5} upsert {result['upsert_points_per_s']:8.0f} points/s, "
+            f"scroll {result['scroll_points_per_s']:8.0f} points/s, "
+            f"max batch {result['max_batch_size']}{cap}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,18 @@
 from qdrant_client import QdrantClient
 from pymongo import MongoClient
 from bson import ObjectId
+import json
 import os
 import re
+import time
 from tqdm import tqdm
 import logging
 from dotenv import load_dotenv
+from opentelemetry import trace
+from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor
 from qdrant_client.http import models as rest
 
 
@@ -16,25 +23,138 @@ logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
 )
 logger = logging.getLogger(__name__)
+tracer = trace.get_tracer(__name__)
 
+# Qdrant's default, used when restoring indexing after a bulk load (in KB)
+DEFAULT_INDEXING_THRESHOLD = 20000
+# Accepted QDRANT_MIGRATION_QUANTIZATION values; empty keeps the source's quantization
+QUANTIZATION_MODES = ("", "scalar", "binary")
 
-def run_migration():
-    # Connect to Qdrant
+
+def setup_tracing():
+    """Export spans to the otel-collector when OTEL_EXPORTER_OTLP_ENDPOINT is set, otherwise spans are no-ops."""
+    if not os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT"):
+        return None
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": os.getenv("OTEL_SERVICE_NAME", "qdrant-collection-migration")})
+    )
+    provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+    trace.set_tracer_provider(provider)
+    return provider
+
+
+def estimate_points_bytes(points):
+    """Approximate transfer size of points: float32 vectors plus JSON payloads."""
+    size = 0
+    for point in points:
+        vectors = point.vector.values() if isinstance(point.vector, dict) else [point.vector]
+        size += sum(4 * len(vector) for vector in vectors if isinstance(vector, list))
+        size += len(json.dumps(point.payload or {}, default=str))
+    return size
+
+
+def wait_for_green(qdrant_client, collection_name, timeout):
+    """Block until the collection finished optimizing (status GREEN)."""
+    deadline = time.monotonic() + timeout
+    while True:
+        status = qdrant_client.get_collection(collection_name=collection_name).status
+        if status == rest.CollectionStatus.GREEN:
+            return True
+        if time.monotonic() > deadline:
+            logger.warning(f"Collection {collection_name} still {status} after {timeout}s")
+            return False
+        time.sleep(2)
+
+
+def restore_indexing(qdrant_client, collection_name, hnsw_config, optimizer_config):
+    """Re-enable indexing on a bulk-loaded collection with the source settings.
+
+    A source without an explicit `indexing_threshold` gets Qdrant's default,
+    since leaving it unset in the diff would keep indexing disabled.
+    """
+    optimizer_config = dict(optimizer_config)
+    if not optimizer_config.get("indexing_threshold"):
+        optimizer_config["indexing_threshold"] = DEFAULT_INDEXING_THRESHOLD
+    qdrant_client.update_collection(
+        collection_name=collection_name,
+        hnsw_config=rest.HnswConfigDiff(**hnsw_config),
+        optimizers_config=rest.OptimizersConfigDiff(**optimizer_config),
+    )
+
+
+def get_qdrant_client(prefer_grpc=None):
+    """Create the Qdrant client from the environment.
+
+    With `QDRANT_PREFER_GRPC=true` scroll and upsert go over gRPC on
+    `QDRANT_GRPC_PORT`, which sends vectors as packed floats instead of JSON.
+    """
     qdrant_host = os.getenv("QDRANT_HOST", "localhost")
     qdrant_port = int(os.getenv("QDRANT_PORT", "6333"))
+    qdrant_grpc_port = int(os.getenv("QDRANT_GRPC_PORT", "6334"))
     qdrant_api_key = os.getenv("QDRANT_API_KEY")
-    qdrant_https = os.getenv("QDRANT_USE_HTTPS", False)
-    # Get batch size from environment variable or use a smaller default (32 instead of 128)
-    batch_size = int(os.getenv("QDRANT_MIGRATION_BATCH_SIZE", "32"))
+    qdrant_https = os.getenv("QDRANT_USE_HTTPS", "false").lower() == "true"
+    if prefer_grpc is None:
+        prefer_grpc = os.getenv("QDRANT_PREFER_GRPC", "false").lower() == "true"
 
-    # Connect to Qdrant
-    qdrant_client = QdrantClient(
+    return QdrantClient(
         host=qdrant_host,
         port=qdrant_port,
+        grpc_port=qdrant_grpc_port,
+        prefer_grpc=prefer_grpc,
         https=qdrant_https,
         api_key=qdrant_api_key,
     )
 
+
+def is_payload_too_large(error):
+    """Whether an upsert failed because the request was too big (REST 413 or gRPC size limit)."""
+    message = str(error)
+    return "413" in message or "RESOURCE_EXHAUSTED" in message or "larger than max" in message
+
+
+def build_quantization_config(mode):
+    """Quantization for the target collections: "scalar" (int8), "binary" or None to keep the source's."""
+    if mode == "scalar":
+        return rest.ScalarQuantization(
+            scalar=rest.ScalarQuantizationConfig(
+                type=rest.ScalarType.INT8,
+                quantile=0.99,
+                always_ram=True,
+            )
+        )
+    if mode == "binary":
+        return rest.BinaryQuantization(
+            binary=rest.BinaryQuantizationConfig(always_ram=True)
+        )
+    return None
+
+
+def with_on_disk_vectors(vectors_config):
+    """Copy of the vectors config with the original vectors stored on disk (memmap)."""
+    if isinstance(vectors_config, dict):
+        return {name: params.model_copy(update={"on_disk": True}) for name, params in vectors_config.items()}
+    return vectors_config.model_copy(update={"on_disk": True})
+
+
+def run_migration():
+    # Get batch size from environment variable or use a smaller default (32 instead of 128)
+    batch_size = int(os.getenv("QDRANT_MIGRATION_BATCH_SIZE", "32"))
+    # Bulk-load mode creates the target collections with indexing disabled and
+    # builds the HNSW index once, after all points were copied
+    bulk_load = os.getenv("QDRANT_MIGRATION_BULK_LOAD", "false").lower() == "true"
+    index_timeout = int(os.getenv("QDRANT_MIGRATION_INDEX_TIMEOUT", "3600"))
+    # Memory options for the target collections; by default the source settings are copied
+    quantization = os.getenv("QDRANT_MIGRATION_QUANTIZATION", "").lower()
+    if quantization not in QUANTIZATION_MODES:
+        raise ValueError(
+            f"QDRANT_MIGRATION_QUANTIZATION must be one of 'scalar', 'binary' or empty, got '{quantization}'"
+        )
+    on_disk_vectors = os.getenv("QDRANT_MIGRATION_ON_DISK_VECTORS", "false").lower() == "true"
+    on_disk_payload = os.getenv("QDRANT_MIGRATION_ON_DISK_PAYLOAD", "false").lower() == "true"
+
+    # Connect to Qdrant
+    qdrant_client = get_qdrant_client()
+
     # Connect to MongoDB
     mongo_uri = os.getenv("MONGODB_URI")
     if not mongo_uri:
@@ -83,98 +203,162 @@ def run_migration():
 
     # Perform the migration for each collection
     for old_name, new_name in tqdm(mappings.items(), desc="Migrating collections"):
-        try:
-            # Check if the collection exists
-            if old_name in collection_names:
-                # Get collection info to recreate with same parameters
-                collection_info = None
-                for collection in collections:
-                    if collection.name == old_name:
-                        collection_info = collection
-                        break
-
-                if collection_info:
-                    # Get detailed collection information including configuration
-                    detailed_info = qdrant_client.get_collection(
-                        collection_name=old_name
-                    )
-
-                    if new_name in collection_names:
-                        logger.info(f"Collection {new_name} already exists - skipping the process.")
-                        continue
-
-                    # Create the new collection with the same parameters
-                    qdrant_client.create_collection(
-                        collection_name=new_name,
-                        vectors_config=detailed_info.config.params.vectors,
-                        hnsw_config=detailed_info.config.hnsw_config.__dict__,
-                        optimizers_config=detailed_info.config.optimizer_config.__dict__,
-                        wal_config=detailed_info.config.wal_config.__dict__,
-                        quantization_config=detailed_info.config.quantization_config,
-                    )
-
-                    # Get all data from the old collection in batches
-                    # Using a smaller batch size to prevent "413 Payload Too Large" errors
-                    
-                    # scroll returns (records, next_offset)
-                    next_offset = None
-
-                    while True:
-                        records, next_offset = qdrant_client.scroll(
-                            collection_name=old_name,
-                            limit=batch_size,
-                            offset=next_offset,
-                            with_payload=True,
-                            with_vectors=True,
+        with tracer.start_as_current_span(
+            "copy_collection", attributes={"source": old_name, "target": new_name}
+        ) as collection_span:
+            try:
+                # Check if the collection exists
+                if old_name in collection_names:
+                    # Get collection info to recreate with same parameters
+                    collection_info = None
+                    for collection in collections:
+                        if collection.name == old_name:
+                            collection_info = collection
+                            break
+
+                    if collection_info:
+                        # Get detailed collection information including configuration
+                        detailed_info = qdrant_client.get_collection(
+                            collection_name=old_name
                         )
 
-                        if not records:
-                            break
+                        if new_name in collection_names:
+                            logger.info(f"Collection {new_name} already exists - skipping the process.")
+                            target_optimizers = qdrant_client.get_collection(new_name).config.optimizer_config
+                            if bulk_load and target_optimizers.indexing_threshold == 0:
+                                # A previous bulk load stopped before indexing was restored
+                                logger.warning(f"Collection {new_name} has indexing disabled - restoring it")
+                                with tracer.start_as_current_span("index"):
+                                    restore_indexing(
+                                        qdrant_client,
+                                        new_name,
+                                        detailed_info.config.hnsw_config.__dict__,
+                                        detailed_info.config.optimizer_config.__dict__,
+                                    )
+                                    wait_for_green(qdrant_client, new_name, index_timeout)
+                            continue
 
-                        points = [
-                            rest.PointStruct(
-                                id=rec.id, vector=rec.vector, payload=rec.payload
-                            )
-                            for rec in records
-                        ]
+                        hnsw_config = detailed_info.config.hnsw_config.__dict__
+                        optimizers_config = detailed_info.config.optimizer_config.__dict__
+                        if bulk_load:
+                            # indexing_threshold=0 disables indexing while points are upserted
+                            optimizers_config = {**optimizers_config, "indexing_threshold": 0}
+
+                        vectors_config = detailed_info.config.params.vectors
+                        if on_disk_vectors:
+                            vectors_config = with_on_disk_vectors(vectors_config)
+
+                        # Create the new collection with the same parameters
+                        qdrant_client.create_collection(
+                            collection_name=new_name,
+                            vectors_config=vectors_config,
+                            hnsw_config=hnsw_config,
+                            optimizers_config=optimizers_config,
+                            wal_config=detailed_info.config.wal_config.__dict__,
+                            quantization_config=(
+                                build_quantization_config(quantization)
+                                or detailed_info.config.quantization_config
+                            ),
+                            on_disk_payload=on_disk_payload or detailed_info.config.params.on_disk_payload,
+                        )
 
+                        copy_succeeded = False
                         try:
-                            qdrant_client.upsert(
-                                collection_name=new_name,
-                                points=points,
-                                wait=True,
-                            )
-                        except Exception as upsert_error:
-                            if "413" in str(upsert_error):
-                                # If we hit a payload too large error, try with a smaller batch
-                                logger.warning(f"Payload too large with batch size {len(points)}, attempting with smaller batches")
-                                # Split the batch in half and retry each half
-                                mid = len(points) // 2
-                                for sub_batch in [points[:mid], points[mid:]]:
-                                    if sub_batch:
+                            # Get all data from the old collection in batches
+                            # Using a smaller batch size to prevent "413 Payload Too Large" errors
+                    
+                            # scroll returns (records, next_offset)
+                            next_offset = None
+                            copied_points = 0
+
+                            while True:
+                                with tracer.start_as_current_span("scroll") as span:
+                                    records, next_offset = qdrant_client.scroll(
+                                        collection_name=old_name,
+                                        limit=batch_size,
+                                        offset=next_offset,
+                                        with_payload=True,
+                                        with_vectors=True,
+                                    )
+                                    span.set_attribute("points", len(records))
+
+                                if not records:
+                                    break
+
+                                points = [
+                                    rest.PointStruct(
+                                        id=rec.id, vector=rec.vector, payload=rec.payload
+                                    )
+                                    for rec in records
+                                ]
+
+                                upsert_span = tracer.start_span("upsert", attributes={"points": len(points)})
+                                if upsert_span.is_recording():
+                                    upsert_span.set_attribute("bytes", estimate_points_bytes(points))
+                                try:
+                                    with trace.use_span(upsert_span, end_on_exit=True):
                                         qdrant_client.upsert(
                                             collection_name=new_name,
-                                            points=sub_batch,
+                                            points=points,
                                             wait=True,
                                         )
-                                logger.info(f"Successfully inserted with smaller sub-batches")
-                            else:
-                                # Re-raise other errors
-                                raise upsert_error
+                                except Exception as upsert_error:
+                                    if is_payload_too_large(upsert_error):
+                                        # If we hit a payload too large error, try with a smaller batch
+                                        logger.warning(f"Payload too large with batch size {len(points)}, attempting with smaller batches")
+                                        # Split the batch in half and retry each half
+                                        mid = len(points) // 2
+                                        for sub_batch in [points[:mid], points[mid:]]:
+                                            if sub_batch:
+                                                qdrant_client.upsert(
+                                                    collection_name=new_name,
+                                                    points=sub_batch,
+                                                    wait=True,
+                                                )
+                                        logger.info(f"Successfully inserted with smaller sub-batches")
+                                    else:
+                                        # Re-raise other errors
+                                        raise upsert_error
 
-                        # no more pages
-                        if next_offset is None:
-                            break
-                    logger.info(
-                        f"Successfully migrated collection: {old_name} -> {new_name}"
-                    )
-                else:
-                    logger.error(f"Could not get collection info for {old_name}")
-        except Exception as e:
-            logger.error(
-                f"Error migrating collection {old_name} to {new_name}: {str(e)}"
-            )
+                                copied_points += len(points)
+
+                                # no more pages
+                                if next_offset is None:
+                                    break
+
+                            collection_span.set_attribute("points", copied_points)
+                            copy_succeeded = True
+                        finally:
+                            if bulk_load:
+                                # Restore the source index settings and build the index once; this
+                                # also runs after a failed copy so the target is never left unindexed
+                                logger.info(f"Restoring index settings of {new_name}")
+                                with tracer.start_as_current_span("index"):
+                                    restore_indexing(
+                                        qdrant_client,
+                                        new_name,
+                                        hnsw_config,
+                                        detailed_info.config.optimizer_config.__dict__,
+                                    )
+                                    if copy_succeeded:
+                                        logger.info(f"Waiting for indexing of {new_name}")
+                                        wait_for_green(qdrant_client, new_name, index_timeout)
+
+                        logger.info(
+                            f"Successfully migrated collection: {old_name} -> {new_name}"
+                        )
+                    else:
+                        logger.error(f"Could not get collection info for {old_name}")
+            except Exception as e:
+                logger.error(
+                    f"Error migrating collection {old_name} to {new_name}: {str(e)}"
+                )
 
 
 if __name__ == "__main__":
-    run_migration()
+    tracer_provider = setup_tracing()
+    try:
+        run_migration()
+    finally:
+        if tracer_provider:
+            tracer_provider.shutdown()
@@ -0,0 +1,151 @@
+"""
+Compare quantization options for a Qdrant collection before copying it.
+
+Samples stored vectors from an existing collection, loads them into temporary
+collections without quantization, with scalar (int8) and with binary
+quantization, and reports recall@k against exact search together with the
+estimated RAM needed for the vectors of the full collection. Use it to pick
+`QDRANT_MIGRATION_QUANTIZATION` / `QDRANT_MIGRATION_ON_DISK_VECTORS` for V001.
+
+Usage:
+    python V001_quantization_report.py --collection NAME [--sample N] [--queries N] [--k N]
+"""
+import argparse
+import logging
+import math
+
+from qdrant_client.http import models as rest
+
+from V001_collection_names import build_quantization_config, get_qdrant_client, wait_for_green
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+MODES = ["none", "scalar", "binary"]
+
+
+def sample_vectors(client, collection_name, count):
+    """Scroll up to `count` stored vectors; named vectors use the first name."""
+    vectors = []
+    next_offset = None
+    while len(vectors) < count:
+        records, next_offset = client.scroll(
+            collection_name=collection_name,
+            limit=min(256, count - len(vectors)),
+            offset=next_offset,
+            with_payload=False,
+            with_vectors=True,
+        )
+        for record in records:
+            vector = record.vector
+            if isinstance(vector, dict):
+                vector = next(iter(vector.values()))
+            vectors.append(vector)
+        if next_offset is None:
+            break
+    return vectors
+
+
+def estimate_vector_ram(points, dim, mode, on_disk):
+    """Bytes of RAM for vector storage: float32 originals unless on disk, plus quantized copies."""
+    original = 0 if on_disk else points * dim * 4
+    quantized = {
+        "none": 0,
+        "scalar": points * dim,
+        "binary": points * math.ceil(dim / 8),
+    }[mode]
+    return original + quantized
+
+
+def search_ids(client, collection_name, queries, k, search_params):
+    return [
+        {point.id for point in client.query_points(
+            collection_name=collection_name,
+            query=query,
+            limit=k,
+            search_params=search_params,
+        ).points}
+        for query in queries
+    ]
+
+
+def recall(expected, found):
+    hits = sum(len(e & f) for e, f in zip(expected, found))
+    total = sum(len(e) for e in expected)
+    return hits / total if total else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Report memory footprint and recall@k of quantization options for a collection"
+    )
+    parser.add_argument("--collection", required=True, help="Source collection to sample")
+    parser.add_argument("--sample", type=int, default=10000, help="Stored vectors loaded per option")
+    parser.add_argument("--queries", type=int, default=100, help="Held-out vectors used as queries")
+    parser.add_argument("--k", type=int, default=10, help="k for recall@k")
+    args = parser.parse_args()
+
+    client = get_qdrant_client()
+    info = client.get_collection(args.collection)
+    params = info.config.params.vectors
+    if isinstance(params, dict):
+        params = next(iter(params.values()))
+
+    vectors = sample_vectors(client, args.collection, args.sample + args.queries)
+    queries, base = vectors[:args.queries], vectors[args.queries:]
+    if not queries or not base:
+        logger.error(f"Collection {args.collection} has too few points to sample")
+        return
+
+    results = {}
+    try:
+        for mode in MODES:
+            name = f"quantization_report_{mode}"
+            if client.collection_exists(name):
+                client.delete_collection(name)
+            client.create_collection(
+                collection_name=name,
+                vectors_config=rest.VectorParams(size=params.size, distance=params.distance),
+                quantization_config=build_quantization_config(mode),
+            )
+            client.upload_collection(collection_name=name, vectors=base, ids=range(len(base)), batch_size=256)
+            wait_for_green(client, name, timeout=600)
+
+        exact = search_ids(client, "quantization_report_none", queries, args.k, rest.SearchParams(exact=True))
+        for mode in MODES:
+            name = f"quantization_report_{mode}"
+            if mode == "none":
+                results[mode] = {"raw": recall(exact, search_ids(client, name, queries, args.k, None))}
+                results[mode]["rescored"] = results[mode]["raw"]
+                continue
+            raw = search_ids(
+                client, name, queries, args.k,
+                rest.SearchParams(quantization=rest.QuantizationSearchParams(rescore=False)),
+            )
+            rescored = search_ids(
+                client, name, queries, args.k,
+                rest.SearchParams(quantization=rest.QuantizationSearchParams(rescore=True, oversampling=2.0)),
+            )
+            results[mode] = {"raw": recall(exact, raw), "rescored": recall(exact, rescored)}
+    finally:
+        for mode in MODES:
+            client.delete_collection(f"quantization_report_{mode}")
+
+    points = info.points_count or 0
+    logger.info("=" * 60)
+    logger.info(f"QUANTIZATION REPORT {args.collection} ({points} points, dim={params.size})")
+    logger.info(f"recall@{args.k} on {len(base)} sampled vectors, {len(queries)} queries")
+    logger.info("=" * 60)
+    for mode in MODES:
+        ram = estimate_vector_ram(points, params.size, mode, on_disk=False) / 2**20
+        ram_on_disk = estimate_vector_ram(points, params.size, mode, on_disk=True) / 2**20
+        logger.info(
+            f"{mode:<7} recall {results[mode]['raw']:.3f} (rescored {results[mode]['rescored']:.3f}), "
+            f"vector RAM {ram:.0f} MiB, with on_disk vectors {ram_on_disk:.0f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
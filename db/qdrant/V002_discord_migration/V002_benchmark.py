@@ -0,0 +1,495 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark for the Discord PostgreSQL to Qdrant migration.
+
+This script generates synthetic `data_discord` and `data_discord_summary`
+tables in a local PostgreSQL (pgvector) instance, runs the Discord
+configuration of `PGVectorToQdrantMigrator` against them and reports
+throughput, peak memory and the time spent in every migration stage.
+
+Temporal is replaced by a local test server with a stub
+`BatchVectorIngestionWorkflow` worker that writes into an in-memory
+`QdrantClient`, so no production service is touched. The migrator itself
+runs in a spawned process, so its peak RSS excludes the data generator, the
+Temporal worker and the sink.
+
+The PostgreSQL stand-in is configured through the usual `POSTGRES_*`
+variables, e.g. `docker run -p 5432:5432 -e POSTGRES_PASSWORD=pass pgvector/pgvector:pg16`.
+
+Usage:
+    python V002_benchmark.py [--rows N] [--summary-rows N] [--dim N] [--communities N] [--rerun] [--keep-data] [--output FILE]
+"""
+import argparse
+import asyncio
+import io
+import json
+import logging
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import psycopg2
+from dotenv import load_dotenv
+from qdrant_client import QdrantClient
+from qdrant_client.http import models as rest
+from temporalio import activity, workflow
+from temporalio.client import Client
+from temporalio.testing import WorkflowEnvironment
+from temporalio.worker import UnsandboxedWorkflowRunner, Worker
+
+import V002_migrate_discord_pgvector as v002
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+TASK_QUEUE = v002.DEFAULT_TASK_QUEUE
+# Synthetic rows generated and sent per COPY
+COPY_BATCH_ROWS = 1000
+STAGES = ["query", "fetch", "date_conversion", "fingerprint", "model_build", "submit"]
+
+
+def postgres_connection(dbname: str):
+    return psycopg2.connect(
+        host=os.getenv("POSTGRES_HOST", "localhost"),
+        port=int(os.getenv("POSTGRES_PORT", "5432")),
+        user=os.getenv("POSTGRES_USER", "postgres"),
+        password=os.getenv("POSTGRES_PASS"),
+        dbname=dbname,
+    )
+
+
+class SyntheticDiscordData:
+    """Creates and drops a synthetic community database with Discord tables."""
+
+    def __init__(self, community_id: str, dim: int, seed: int = 0):
+        self.community_id = community_id
+        self.dbname = f"community_{community_id}"
+        self.dim = dim
+        self.random = random.Random(seed)
+
+    def create_database(self):
+        conn = postgres_connection(os.getenv("POSTGRES_DBNAME", "postgres"))
+        conn.autocommit = True
+        cursor = conn.cursor()
+        cursor.execute(f'DROP DATABASE IF EXISTS "{self.dbname}";')
+        cursor.execute(f'CREATE DATABASE "{self.dbname}";')
+        cursor.close()
+        conn.close()
+
+    def drop_database(self):
+        conn = postgres_connection(os.getenv("POSTGRES_DBNAME", "postgres"))
+        conn.autocommit = True
+        cursor = conn.cursor()
+        cursor.execute(f'DROP DATABASE IF EXISTS "{self.dbname}";')
+        cursor.close()
+        conn.close()
+
+    def _rows(self, count: int, date_format: str, step: timedelta):
+        start = datetime(2023, 1, 1)
+        for i in range(count):
+            metadata = {
+                "date": (start + i * step).strftime(date_format),
+                "author_id": str(self.random.randrange(10**17, 10**18)),
+                "channel": f"channel-{self.random.randrange(20)}",
+                "thread": None,
+                "excludedEmbedMetadataKeys": ["author_id", "channel"],
+                "excludedLlmMetadataKeys": ["author_id"],
+            }
+            embedding = "[" + ",".join(f"{self.random.uniform(-1, 1):.6f}" for _ in range(self.dim)) + "]"
+            text = " ".join(f"word{self.random.randrange(5000)}" for _ in range(self.random.randrange(10, 60)))
+            yield str(uuid.uuid4()), text, json.dumps(metadata), embedding
+
+    def node_ids(self, table: str) -> set[str]:
+        conn = postgres_connection(self.dbname)
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT node_id FROM {table};")
+        node_ids = {row[0] for row in cursor.fetchall()}
+        cursor.close()
+        conn.close()
+        return node_ids
+
+    def populate_table(self, table: str, count: int, date_format: str, step: timedelta):
+        """Bulk load `count` synthetic rows into `table` with COPY."""
+        conn = postgres_connection(self.dbname)
+        cursor = conn.cursor()
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS vector;")
+        cursor.execute(f"""
+            CREATE TABLE {table} (
+                id BIGSERIAL PRIMARY KEY,
+                text VARCHAR NOT NULL,
+                metadata_ JSON,
+                node_id VARCHAR,
+                embedding VECTOR({self.dim})
+            );
+        """)
+
+        # COPY in bounded batches so the generator never holds the whole table
+        buffer = io.StringIO()
+        for i, (node_id, text, metadata, embedding) in enumerate(self._rows(count, date_format, step), 1):
+            escaped = metadata.replace("\\", "\\\\")
+            buffer.write(f"{node_id}\t{text}\t{escaped}\t{embedding}\n")
+            if i % COPY_BATCH_ROWS == 0 or i == count:
+                buffer.seek(0)
+                cursor.copy_expert(
+                    f"COPY {table} (node_id, text, metadata_, embedding) FROM STDIN",
+                    buffer,
+                )
+                buffer = io.StringIO()
+        conn.commit()
+        cursor.close()
+        conn.close()
+        logger.info(f"Generated {count} rows in {self.dbname}.{table}")
+
+
+class QdrantSink:
+    """Activity target storing ingested documents in a local-mode Qdrant."""
+
+    def __init__(self, dim: int):
+        self.dim = dim
+        self.client = QdrantClient(location=":memory:")
+        self.elapsed = 0.0
+
+    def point_ids(self, collection_name: str) -> set[str]:
+        if not self.client.collection_exists(collection_name):
+            return set()
+        ids = set()
+        offset = None
+        while True:
+            records, offset = self.client.scroll(
+                collection_name=collection_name,
+                limit=1000,
+                offset=offset,
+                with_payload=False,
+                with_vectors=False,
+            )
+            ids.update(str(record.id) for record in records)
+            if offset is None:
+                return ids
+
+    @activity.defn(name="BenchmarkQdrantUpsert")
+    async def upsert(self, payload: dict) -> int:
+        start = time.perf_counter()
+        collection_name = f"{payload['communityId']}_{payload.get('collectionName') or payload['platformId']}"
+        if not self.client.collection_exists(collection_name):
+            self.client.create_collection(
+                collection_name=collection_name,
+                vectors_config=rest.VectorParams(size=self.dim, distance=rest.Distance.COSINE),
+            )
+        # Real ingestion re-embeds the text; a constant vector keeps the stub cheap
+        vector = [1.0] * self.dim
+        points = [
+            rest.PointStruct(
+                id=doc["docId"],
+                vector=vector,
+                # Laid out like llama-index payloads: flat metadata plus the source doc_id
+                payload={"text": doc["text"], "doc_id": doc["docId"], **doc["metadata"]},
+            )
+            for doc in payload["document"]
+        ]
+        self.client.upsert(collection_name=collection_name, points=points)
+        self.elapsed += time.perf_counter() - start
+        return len(points)
+
+
+@workflow.defn(name="BatchVectorIngestionWorkflow")
+class StubBatchVectorIngestionWorkflow:
+    @workflow.run
+    async def run(self, payload: dict) -> int:
+        return await workflow.execute_activity(
+            "BenchmarkQdrantUpsert",
+            payload,
+            start_to_close_timeout=timedelta(hours=1),
+        )
+
+
+class LocalTemporal:
+    """Runs a Temporal dev server plus the stub worker on a background thread."""
+
+    def __init__(self, sink: QdrantSink):
+        self.sink = sink
+        self.target_host = None
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._error = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self, timeout: float = 120):
+        self._thread.start()
+        if not self._ready.wait(timeout) or self._error:
+            raise RuntimeError(f"Local Temporal server failed to start: {self._error}")
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join(timeout=30)
+
+    def _run(self):
+        try:
+            asyncio.run(self._serve())
+        except Exception as e:
+            self._error = e
+            self._ready.set()
+
+    async def _serve(self):
+        # Lift the blob limits so large --chunk-size values can be benchmarked too
+        env = await WorkflowEnvironment.start_local(
+            dev_server_extra_args=[
+                "--dynamic-config-value", "limit.blobSize.warn=1073741824",
+                "--dynamic-config-value", "limit.blobSize.error=1073741824",
+            ],
+        )
+        try:
+            self.target_host = env.client.service_client.config.target_host
+            async with Worker(
+                env.client,
+                task_queue=TASK_QUEUE,
+                workflows=[StubBatchVectorIngestionWorkflow],
+                activities=[self.sink.upsert],
+                workflow_runner=UnsandboxedWorkflowRunner(),
+            ):
+                self._ready.set()
+                await asyncio.get_running_loop().run_in_executor(None, self._stop.wait)
+        finally:
+            await env.shutdown()
+
+
+class LocalTemporalClient:
+    """Drop-in for `TemporalClient` that connects to the local test server."""
+
+    target_host = None
+
+    async def get_client(self) -> Client:
+        return await Client.connect(self.target_host)
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is reported in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure_migration(
+    target_host: str,
+    platforms: list[dict],
+    dry_run: bool,
+    chunk_size: int,
+    known_fingerprints: dict | None,
+) -> dict:
+    """Run the Discord migration in this (spawned) process and measure it.
+
+    Running in its own process keeps the synthetic data generator, the Temporal
+    worker and the in-memory Qdrant sink out of the peak RSS. The sink cannot
+    be shared across processes, so stored fingerprints are passed in already
+    loaded, per collection. The synthetic communities are migrated through
+    `run_migration`, one worker per community.
+    """
+    LocalTemporalClient.target_host = target_host
+    v002.TemporalClient = LocalTemporalClient
+
+    fingerprints = None
+    if known_fingerprints is not None:
+        fingerprints = v002.FingerprintCache(client=None)
+        fingerprints.known = known_fingerprints
+
+    migrator = v002.PGVectorToQdrantMigrator(
+        platforms=[v002.PLATFORMS["discord"]],
+        dry_run=dry_run,
+        chunk_size=chunk_size,
+        jobs=len(platforms),
+        fingerprints=fingerprints,
+    )
+    # The synthetic platforms are not registered in MongoDB
+    migrator.get_platforms = lambda: platforms
+
+    rss_before = peak_rss_mb()
+    start = time.perf_counter()
+    success = migrator.run_migration()
+    elapsed = time.perf_counter() - start
+    rss_after = peak_rss_mb()
+
+    return {
+        "success": success,
+        "elapsed_s": elapsed,
+        "peak_rss_mb": rss_after,
+        "peak_rss_growth_mb": rss_after - rss_before,
+        "stages_s": {stage: migrator.stage_timings.get(stage, 0.0) for stage in STAGES},
+        "skipped": migrator.skipped_documents,
+        "submitted": migrator.processed_documents + migrator.processed_summaries,
+    }
+
+
+def check_isolation(sink: QdrantSink, datasets: list[tuple["SyntheticDiscordData", str]]) -> bool:
+    """Every collection must hold exactly the node ids of its own community's table."""
+    suffix = v002.PLATFORMS["discord"].collection_suffix
+    isolated = True
+    for data, platform_id in datasets:
+        for table, collection_name in (
+            ("data_discord", f"{data.community_id}_{platform_id}"),
+            ("data_discord_summary", f"{data.community_id}_{platform_id}{suffix}"),
+        ):
+            expected = data.node_ids(table)
+            stored = sink.point_ids(collection_name)
+            if stored != expected:
+                logger.error(
+                    f"{collection_name}: {len(stored - expected)} foreign and "
+                    f"{len(expected - stored)} missing documents"
+                )
+                isolated = False
+    return isolated
+
+
+def run_benchmark(args) -> dict:
+    datasets = []
+    for i in range(args.communities):
+        suffix = str(i) if args.communities > 1 else ""
+        data = SyntheticDiscordData(f"{args.community_id}{suffix}", args.dim, seed=args.seed + i)
+        data.create_database()
+        data.populate_table("data_discord", args.rows, "%Y-%m-%d %H:%M:%S", timedelta(minutes=1))
+        data.populate_table("data_discord_summary", args.summary_rows, "%Y-%m-%d", timedelta(days=1))
+        datasets.append((data, f"{args.platform_id}{suffix}"))
+    platforms = [
+        {"community_id": data.community_id, "platform_id": platform_id, "name": "discord"}
+        for data, platform_id in datasets
+    ]
+
+    sink = QdrantSink(args.dim)
+    temporal = LocalTemporal(sink)
+    temporal.start()
+
+    def known_fingerprints():
+        if not args.rerun:
+            return None
+        cache = v002.FingerprintCache(sink.client)
+        suffix = v002.PLATFORMS["discord"].collection_suffix
+        return {
+            name: cache.load(name)
+            for data, platform_id in datasets
+            for name in (
+                f"{data.community_id}_{platform_id}",
+                f"{data.community_id}_{platform_id}{suffix}",
+            )
+        }
+
+    def migrate():
+        with multiprocessing.get_context("spawn").Pool(1) as pool:
+            return pool.apply(measure_migration, (
+                temporal.target_host,
+                platforms,
+                args.dry_run,
+                args.chunk_size,
+                known_fingerprints(),
+            ))
+
+    rerun = None
+    isolated = None
+    try:
+        result = migrate()
+        if not args.dry_run:
+            isolated = check_isolation(sink, datasets)
+            result["success"] = result["success"] and isolated
+
+        if args.rerun:
+            # Nothing changed in between, so every document should be skipped
+            rerun_result = migrate()
+            result["success"] = result["success"] and rerun_result["success"]
+            rerun = {key: rerun_result[key] for key in ("elapsed_s", "skipped", "submitted")}
+    finally:
+        temporal.stop()
+        if not args.keep_data:
+            for data, _ in datasets:
+                data.drop_database()
+
+    total_rows = (args.rows + args.summary_rows) * args.communities
+    elapsed = result["elapsed_s"]
+    return {
+        "success": result["success"],
+        "communities": args.communities,
+        "rows": args.rows,
+        "summary_rows": args.summary_rows,
+        "dim": args.dim,
+        "chunk_size": args.chunk_size,
+        "dry_run": args.dry_run,
+        "elapsed_s": elapsed,
+        "rows_per_s": total_rows / elapsed if elapsed > 0 else 0.0,
+        "peak_rss_mb": result["peak_rss_mb"],
+        "peak_rss_growth_mb": result["peak_rss_growth_mb"],
+        "stages_s": result["stages_s"],
+        "stub_ingest_s": sink.elapsed,
+        "isolated": isolated,
+        "rerun": rerun,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the Discord PostgreSQL to Qdrant migrator on synthetic data"
+    )
+    parser.add_argument("--rows", type=int, default=10000, help="Rows in data_discord")
+    parser.add_argument("--summary-rows", type=int, default=1000, help="Rows in data_discord_summary")
+    parser.add_argument("--dim", type=int, default=1024, help="Embedding dimension")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Rows sent per ingestion workflow")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the generator")
+    parser.add_argument(
+        "--community-id",
+        default="benchmark",
+        help="Synthetic community id (database community_<id> is recreated)"
+    )
+    parser.add_argument("--platform-id", default="benchmark", help="Synthetic platform id")
+    parser.add_argument(
+        "--communities",
+        type=int,
+        default=1,
+        help="Synthetic communities migrated in parallel (ids get a numeric suffix when > 1)"
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Benchmark the migrator's dry-run mode")
+    parser.add_argument(
+        "--rerun",
+        action="store_true",
+        help="Fingerprint documents and time a second, unchanged run that should skip them all"
+    )
+    parser.add_argument("--keep-data", action="store_true", help="Keep the synthetic database afterwards")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+
+    args = parser.parse_args()
+
+    result = run_benchmark(args)
+
+    logger.info("=" * 60)
+    logger.info("BENCHMARK RESULTS")
+    logger.info("=" * 60)
+    logger.info(
+        f"Rows: {args.rows} documents + {args.summary_rows} summaries per community, "
+        f"{args.communities} communities, dim={args.dim}"
+    )
+    logger.info(f"Total time: {result['elapsed_s']:.2f}s ({result['rows_per_s']:.0f} rows/s)")
+    logger.info(f"Peak RSS: {result['peak_rss_mb']:.1f} MiB (+{result['peak_rss_growth_mb']:.1f} MiB during migration)")
+    for stage, seconds in result["stages_s"].items():
+        logger.info(f"  {stage:<16} {seconds:8.3f}s")
+    logger.info(f"  {'(stub ingest)':<16} {result['stub_ingest_s']:8.3f}s")
+    if result["isolated"] is not None:
+        logger.info(f"Community isolation: {'OK' if result['isolated'] else 'FAILED'}")
+    if result["rerun"]:
+        logger.info(
+            f"Rerun: {result['rerun']['elapsed_s']:.2f}s, {result['rerun']['skipped']} unchanged skipped, "
+            f"{result['rerun']['submitted']} submitted"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+
+    sys.exit(0 if result["success"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Content fingerprints that let reruns of the migration skip unchanged documents.
+
+Each migrated document carries `metadata['fingerprint']`, a hash of its text,
+metadata and embedding, which ingestion stores in the Qdrant payload next to
+the `doc_id`. Before a collection is loaded, its known fingerprints are read
+with a payload-only scroll, and only documents that are new or whose
+fingerprint differs are sent again.
+"""
+import hashlib
+import json
+import logging
+
+from qdrant_client import QdrantClient
+
+from V002_spool import parse_pgvector
+
+logger = logging.getLogger(__name__)
+
+FINGERPRINT_KEY = "fingerprint"
+# Payload key llama-index stores the source document id under
+DOC_ID_KEY = "doc_id"
+
+
+def fingerprint(text: str, metadata: dict, embedding) -> str:
+    """Hash of a document's text, metadata and embedding (float32, None if missing)."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update((text or "").encode())
+    digest.update(b"\0")
+    metadata = {key: value for key, value in (metadata or {}).items() if key != FINGERPRINT_KEY}
+    digest.update(json.dumps(metadata, sort_keys=True, default=str).encode())
+    digest.update(b"\0")
+    if embedding is not None:
+        digest.update(parse_pgvector(embedding).tobytes())
+    return digest.hexdigest()
+
+
+class FingerprintCache:
+    def __init__(self, client: QdrantClient, batch_size: int = 1000):
+        self.client = client
+        self.batch_size = batch_size
+        # Collection name -> {doc_id: fingerprint}
+        self.known = {}
+
+    def load(self, collection_name: str) -> dict[str, str]:
+        """Fingerprints already stored in a collection.
+
+        Empty if the collection does not exist yet or cannot be read, in which
+        case every document of the collection is sent.
+        """
+        if collection_name in self.known:
+            return self.known[collection_name]
+
+        known = {}
+        try:
+            if self.client.collection_exists(collection_name):
+                offset = None
+                while True:
+                    records, offset = self.client.scroll(
+                        collection_name=collection_name,
+                        limit=self.batch_size,
+                        offset=offset,
+                        with_payload=[DOC_ID_KEY, FINGERPRINT_KEY],
+                        with_vectors=False,
+                    )
+                    for record in records:
+                        payload = record.payload or {}
+                        if payload.get(DOC_ID_KEY) and payload.get(FINGERPRINT_KEY):
+                            known[payload[DOC_ID_KEY]] = payload[FINGERPRINT_KEY]
+                    if offset is None:
+                        break
+                logger.info(f"Loaded {len(known)} document fingerprints from {collection_name}")
+        except Exception as e:
+            logger.warning(f"Cannot load fingerprints of {collection_name}, sending every document: {e}")
+            known = {}
+
+        self.known[collection_name] = known
+        return known
@@ -1,52 +1,162 @@
 #!/usr/bin/env python3
 """
-Migration script to move Discord data from PostgreSQL to Qdrant.
+Migration script to move platform data from PostgreSQL to Qdrant.
 
-This script migrates both regular Discord messages and Discord summaries
-from PostgreSQL vector storage to Qdrant vector storage for all Discord platforms.
+This script migrates both the regular documents and the summaries of every
+configured platform type (Discord, Telegram, Discourse, GitHub) from
+PostgreSQL vector storage to Qdrant vector storage. Each platform type is
+described by a `PlatformConfig` in `PLATFORMS`; communities are migrated in
+parallel.
 
 Usage:
-    python V002_migrate_discord_pgvector.py [--dry-run]
+    python V002_migrate_discord_pgvector.py [--dry-run] [--platforms NAME ...] [--jobs N] [--chunk-size N]
+        [--task-queue NAME] [--max-backlog N] [--max-backlog-age S] [--max-pause S] [--no-throttle]
+        [--create-payload-indexes] [--spool-dir DIR] [--refresh-spool] [--resend-all]
 """
 import asyncio
 import argparse
-import ast
+import json
 import logging
+import math
 import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from datetime import datetime
 import os
+from typing import Iterator, NamedTuple
 
-from llama_index.core import Document
-from tc_hivemind_backend.db.postgresql import PostgresSingleton
+import psycopg2
+from tc_hivemind_backend.db.credentials import load_postgres_credentials
 from tc_hivemind_backend.db.mongo import MongoSingleton
 from dotenv import load_dotenv
+from opentelemetry import trace
 from tc_temporal_backend.client import TemporalClient
-from pydantic import BaseModel
+from tracing import setup_tracing, shutdown_tracing
+from V002_fingerprints import FINGERPRINT_KEY, FingerprintCache, fingerprint
+from V002_payload_indexes import PayloadIndexProvisioner, get_qdrant_client
+from V002_spool import ArrowSpool
+from V002_throttle import DEFAULT_TASK_QUEUE, TaskQueueThrottle
 
 
-class BatchDocument(BaseModel):
-    """A model representing a document for batch ingestion.
-    
+class DocumentRow(NamedTuple):
+    """A fetched PostgreSQL row, kept as a plain tuple until it is serialized.
+
+    The embedding is carried in its raw pgvector form (or as float32 when read
+    from a spool). The ingestion workflow does not take embeddings; they are
+    only decoded to compute the row's fingerprint (see `skip_unchanged`).
     """
-    docId: str
+    node_id: str
     text: str
     metadata: dict
-    excludedEmbedMetadataKeys: list[str] = []
-    excludedLlmMetadataKeys: list[str] = []
-
+    embedding: object
+
+    def to_batch_document(self) -> dict:
+        """Serialize into the `BatchDocument` shape of BatchVectorIngestionWorkflow."""
+        metadata = self.metadata or {}
+        # The fingerprint is bookkeeping for reruns and must not change embeddings or prompts
+        excluded = [FINGERPRINT_KEY] if FINGERPRINT_KEY in metadata else []
+        return {
+            "docId": self.node_id,
+            "text": self.text,
+            "metadata": metadata,
+            "excludedEmbedMetadataKeys": metadata.get("excludedEmbedMetadataKeys", []) + excluded,
+            "excludedLlmMetadataKeys": metadata.get("excludedLlmMetadataKeys", []) + excluded,
+        }
+
+
+def build_ingestion_payload(
+    community_id: str,
+    platform_id: str,
+    rows: list[DocumentRow],
+    collection_name: str | None = None,
+) -> dict:
+    """Build the `BatchIngestionRequest` payload for BatchVectorIngestionWorkflow.
+
+    The payload is written as plain dicts so every row is serialized once,
+    straight from its `DocumentRow`, without intermediate model objects.
+    """
+    return {
+        "communityId": community_id,
+        "platformId": platform_id,
+        "collectionName": collection_name,
+        "document": [row.to_batch_document() for row in rows],
+    }
+
+
+class PlatformConfig(NamedTuple):
+    """Where a platform type keeps its pgvector data and how it is migrated."""
+    name: str
+    table: str
+    summary_table: str | None = None
+    # How `metadata_->>'date'` is stored: None for anything PostgreSQL casts to
+    # a timestamptz ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d', ISO 8601 with or without
+    # an offset; dates without one are UTC), "epoch" for numeric timestamps, or
+    # a PostgreSQL `to_timestamp` format string
+    date_format: str | None = None
+    # Appended to the platform id for the summary collection
+    collection_suffix: str = "_summary"
+
+    @property
+    def workflow_name(self) -> str:
+        return f"Ingest{self.name.capitalize()}"
+
+
+# Platform types migrated by default, keyed by the platform `name` in MongoDB
+PLATFORMS = {
+    config.name: config
+    for config in [
+        PlatformConfig("discord", "data_discord", "data_discord_summary"),
+        PlatformConfig("telegram", "data_telegram", "data_telegram_summary"),
+        PlatformConfig("discourse", "data_discourse", "data_discourse_summary"),
+        PlatformConfig("github", "data_github", "data_github_summary"),
+    ]
+}
+
+
+def date_epoch_sql(date_format: str | None) -> str:
+    """SQL computing the UTC epoch of `metadata_->>'date'` for a `PlatformConfig.date_format`.
+
+    Offsets in the dates are honoured; dates without one are read in the
+    session time zone, which `iter_table_chunks` sets to UTC.
+    """
+    if date_format == "epoch":
+        return "(metadata_->>'date')::float8"
+    if date_format is None:
+        timestamp = "(metadata_->>'date')::timestamptz"
+    else:
+        timestamp = f"to_timestamp(metadata_->>'date', '{date_format}')"
+    return f"extract(epoch FROM {timestamp})::float8"
+
+
+# Dates are converted to a UTC epoch by PostgreSQL while the rows are read,
+# see `date_epoch_sql`
+SELECT_DOCUMENTS_QUERY = """
+    SELECT node_id, text, metadata_, embedding, {date_ts} AS date_ts
+    FROM {table}
+    ORDER BY date_ts;
+"""
 
-class BatchIngestionRequest(BaseModel):
-    """A model representing a batch of ingestion requests for document processing.
+def postgres_connection(dbname: str):
+    """Open a new connection to a community database.
 
-    Parameters
-    ----------
-    ingestion_requests : list[IngestionRequest]
-        A list of ingestion requests.
+    `PostgresSingleton` shares one connection per process and ignores `dbname`
+    once connected, so it cannot serve communities migrated in parallel.
     """
-    communityId: str
-    platformId: str
-    collectionName: str | None = None
-    document: list[BatchDocument]
+    creds = load_postgres_credentials()
+    return psycopg2.connect(
+        dbname=dbname,
+        user=creds["user"],
+        password=creds["password"],
+        host=creds["host"],
+        port=creds["port"],
+    )
+
+
+# Rows sampled to estimate the average payload size in dry-run mode
+PLAN_SAMPLE_ROWS = 1000
 
 
 # Configure logging
@@ -55,35 +165,105 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
+tracer = trace.get_tracer(__name__)
 
 load_dotenv()
 
-class DiscordPGToQdrantMigrator:
-    def __init__(self, dry_run: bool = False):
+class PGVectorToQdrantMigrator:
+    def __init__(
+        self,
+        platforms: list[PlatformConfig] = list(PLATFORMS.values()),
+        dry_run: bool = False,
+        chunk_size: int = 1000,
+        jobs: int = 4,
+        payload_indexer: PayloadIndexProvisioner | None = None,
+        spool: ArrowSpool | None = None,
+        refresh_spool: bool = False,
+        task_queue: str = DEFAULT_TASK_QUEUE,
+        throttle: TaskQueueThrottle | None = None,
+        fingerprints: FingerprintCache | None = None,
+    ):
+        self.platforms = {platform.name: platform for platform in platforms}
         self.dry_run = dry_run
-        self.processed_documents = 0
-        self.processed_summaries = 0
-
-    def convert_date_to_timestamp(self, metadata):
-        """Convert date string in metadata to float timestamp."""
-        if metadata and isinstance(metadata, dict) and 'date' in metadata:
+        self.chunk_size = chunk_size
+        # Communities migrated concurrently, see `run_migration`
+        self.jobs = jobs
+        # Queue the ingestion workflows run on; `throttle` watches the same queue
+        self.task_queue = task_queue
+        self.throttle = throttle
+        # Known fingerprints of the target collections; when set, unchanged documents are skipped
+        self.fingerprints = fingerprints
+        self.skipped_documents = 0
+        # Local extract spool; when set, loads read from it instead of PostgreSQL
+        self.spool = spool
+        # Extract again even when the spool still matches the table
+        self.refresh_spool = refresh_spool
+        # Creates payload indexes on the migrated collections when set
+        self.payload_indexer = payload_indexer
+        # Rows migrated per (platform name, "documents" | "summaries")
+        self.processed = defaultdict(int)
+        # Projected totals of a dry run, see `plan_table`
+        self.planned = defaultdict(int)
+        # Accumulated wall time in seconds per migration stage
+        self.stage_timings = defaultdict(float)
+        # Guards the totals above, which are shared by the community workers
+        self.lock = threading.Lock()
+
+    @property
+    def processed_documents(self) -> int:
+        return sum(count for (_, kind), count in self.processed.items() if kind == "documents")
+
+    @property
+    def processed_summaries(self) -> int:
+        return sum(count for (_, kind), count in self.processed.items() if kind == "summaries")
+
+    @contextmanager
+    def timed(self, stage: str):
+        """Accumulate the wall time spent inside the block under `stage`.
+
+        The block is also traced as a span named after the stage, which is
+        yielded so callers can attach row and byte counts.
+        """
+        start = time.perf_counter()
+        with tracer.start_as_current_span(stage) as span:
             try:
-                date_str = metadata['date']
-                if isinstance(date_str, str):
-                    # Try parsing with time first (regular Discord documents)
-                    try:
-                        dt = datetime.strptime(date_str, '%Y-%m-%d %H:%M:%S')
-                    except ValueError:
-                        # Try parsing date only (summaries)
-                        dt = datetime.strptime(date_str, '%Y-%m-%d')
-                    
-                    metadata['date'] = dt.timestamp()
-            except (ValueError, TypeError) as e:
-                logger.warning(f"Could not parse date '{metadata.get('date', 'N/A')}': {e}")
-        return metadata
-
-    def get_discord_platforms(self):
-        """Get all Discord platforms from MongoDB."""
+                yield span
+            finally:
+                elapsed = time.perf_counter() - start
+                with self.lock:
+                    self.stage_timings[stage] += elapsed
+
+    def convert_dates(self, rows) -> list[DocumentRow]:
+        """Write the SQL-computed `date_ts` of each fetched row into its metadata.
+
+        Rows come from `SELECT_DOCUMENTS_QUERY`, where PostgreSQL already turned
+        `metadata_->>'date'` into a UTC epoch, so no string parsing happens here
+        and the result does not depend on the timezone of this machine.
+        """
+        converted = []
+        for node_id, text, metadata, embedding, date_ts in rows:
+            if date_ts is not None and isinstance(metadata, dict):
+                metadata['date'] = float(date_ts)
+            converted.append(DocumentRow(node_id, text, metadata, embedding))
+        return converted
+
+    def skip_unchanged(self, rows: list[DocumentRow], known: dict[str, str]) -> list[DocumentRow]:
+        """Fingerprint rows into their metadata and drop those stored unchanged in Qdrant."""
+        changed = []
+        for row in rows:
+            metadata = row.metadata if isinstance(row.metadata, dict) else {}
+            value = fingerprint(row.text, metadata, row.embedding)
+            if known.get(row.node_id) == value:
+                continue
+            metadata[FINGERPRINT_KEY] = value
+            changed.append(row._replace(metadata=metadata))
+
+        with self.lock:
+            self.skipped_documents += len(rows) - len(changed)
+        return changed
+
+    def get_platforms(self):
+        """Get all active platforms of the configured types from MongoDB."""
         try:
             mongo_instance = MongoSingleton.get_instance()
             if mongo_instance is None:
@@ -98,59 +278,54 @@ class DiscordPGToQdrantMigrator:
             db = client["Core"]
             platforms_collection = db["platforms"]
             
-            # Query for all Discord platforms
-            discord_platforms = platforms_collection.find(
+            # Query for all platforms of the configured types
+            found_platforms = platforms_collection.find(
                 {
-                    "name": "discord",
+                    "name": {"$in": list(self.platforms)},
                     "disconnectedAt": None,
                 }
             )
             
             platforms = []
-            for platform in discord_platforms:
+            for platform in found_platforms:
                 community_id = str(platform["community"])
                 platform_id = str(platform["_id"])
                 platforms.append({
                     "community_id": community_id,
-                    "platform_id": platform_id
+                    "platform_id": platform_id,
+                    "name": platform["name"],
                 })
             
-            logger.info(f"Found {len(platforms)} Discord platforms")
+            logger.info(f"Found {len(platforms)} platforms ({', '.join(self.platforms)})")
             return platforms
             
         except Exception as e:
-            logger.error(f"Error getting Discord platforms from MongoDB: {e}")
+            logger.error(f"Error getting platforms from MongoDB: {e}")
             return []
 
-    def get_discord_document_count(self, dbname: str) -> int:
-        """Get count of Discord documents from a community database."""
+    def get_document_count(self, dbname: str, table: str) -> int:
+        """Get count of documents in `table` of a community database."""
         try:
-            postgres_instance = PostgresSingleton(dbname=dbname)
-            conn = postgres_instance.get_connection()
+            conn = postgres_connection(dbname)
             cursor = conn.cursor()
             
-            # Check if discord table exists
-            cursor.execute("""
-                SELECT EXISTS (
-                    SELECT FROM information_schema.tables 
-                    WHERE table_name = 'data_discord'
-                );
-            """)
+            # Check if the table exists
+            cursor.execute("SELECT to_regclass(%s) IS NOT NULL;", (table,))
             
             result = cursor.fetchone()
-            has_discord_table = result[0] if result else False
+            has_table = result[0] if result else False
             
-            if has_discord_table:
-                cursor.execute("SELECT COUNT(*) FROM data_discord;")
+            if has_table:
+                cursor.execute(f"SELECT COUNT(*) FROM {table};")
                 result = cursor.fetchone()
                 count = result[0] if result else 0
-                logger.info(f"Found {count} Discord documents in {dbname}")
+                logger.info(f"Found {count} documents in {dbname}.{table}")
             else:
                 count = 0
-                logger.info(f"No Discord table found in {dbname}")
+                logger.info(f"No {table} table found in {dbname}")
             
             cursor.close()
-            postgres_instance.close_connection()
+            conn.close()
             
             return count
             
@@ -158,280 +333,440 @@ class DiscordPGToQdrantMigrator:
             logger.error(f"Error getting document count from {dbname}: {e}")
             return 0
 
-    def migrate_discord_documents(self, dbname: str, platform_id: str) -> bool:
-        """Migrate Discord documents from PostgreSQL to Qdrant."""
+    def plan_table(self, dbname: str, table: str) -> dict:
+        """Estimate what migrating `table` would involve, without reading the table.
+
+        Row counts and sizes come from the PostgreSQL catalog, and the average
+        payload size from a small sample, so this stays cheap on any table size.
+        """
+        plan = {
+            "table": table,
+            "rows": 0,
+            "total_bytes": 0,
+            "avg_payload_bytes": 0.0,
+            "payload_bytes": 0,
+            "workflows": 0,
+        }
+
+        conn = postgres_connection(dbname)
+        cursor = conn.cursor()
         try:
-            community_id = dbname.replace("community_", "")
-            
-            logger.info(f"Migrating Discord documents for community {community_id}, platform {platform_id}")
-            
-            # Connect to PostgreSQL
-            postgres_instance = PostgresSingleton(dbname=dbname)
-            conn = postgres_instance.get_connection()
-            cursor = conn.cursor()
-            
-            # Get documents from PostgreSQL (no platform_id filter since it's not stored)
             cursor.execute("""
-                SELECT node_id, text, metadata_, embedding
-                FROM data_discord 
-                ORDER BY (metadata_->>'date')::timestamp;
+                SELECT reltuples::bigint, pg_total_relation_size(oid)
+                FROM pg_class
+                WHERE oid = to_regclass(%s);
+            """, (table,))
+            result = cursor.fetchone()
+            if result is None:
+                return plan
+
+            rows, plan["total_bytes"] = result
+            if rows <= 0:
+                # The table was never analyzed, so there is no estimate to use
+                cursor.execute(f"SELECT COUNT(*) FROM {table};")
+                rows = cursor.fetchone()[0]
+            plan["rows"] = rows
+
+            # octet_length, unlike pg_column_size, measures uncompressed (de-TOASTed) values
+            cursor.execute(f"""
+                SELECT COALESCE(AVG(octet_length(text) + octet_length(metadata_::text) + octet_length(node_id)), 0)
+                FROM (SELECT text, metadata_, node_id FROM {table} LIMIT {PLAN_SAMPLE_ROWS}) AS sample;
             """)
-            
-            documents: list[Document] = []
-            for row in cursor.fetchall():
-                node_id, text, metadata, embedding = row
+            plan["avg_payload_bytes"] = float(cursor.fetchone()[0])
+        finally:
+            cursor.close()
+            conn.close()
+
+        plan["payload_bytes"] = int(plan["rows"] * plan["avg_payload_bytes"])
+        plan["workflows"] = math.ceil(plan["rows"] / self.chunk_size)
+        return plan
+
+    def log_plan(self, dbname: str, plan: dict):
+        with self.lock:
+            for key in ("rows", "total_bytes", "payload_bytes", "workflows"):
+                self.planned[key] += plan[key]
+        logger.info(
+            f"Plan for {dbname}.{plan['table']}: ~{plan['rows']} rows, "
+            f"{plan['total_bytes'] / 2**20:.1f} MiB on disk, "
+            f"~{plan['payload_bytes'] / 2**20:.1f} MiB payload "
+            f"({plan['avg_payload_bytes']:.0f} B/row), {plan['workflows']} workflows"
+        )
+
+    def get_embedding_dim(self, dbname: str, table: str) -> int:
+        """Dimension of the pgvector embeddings in `table` (0 if the table is missing or empty)."""
+        conn = postgres_connection(dbname)
+        cursor = conn.cursor()
+        try:
+            cursor.execute("SELECT to_regclass(%s) IS NOT NULL;", (table,))
+            if not cursor.fetchone()[0]:
+                return 0
+            cursor.execute(f"SELECT vector_dims(embedding) FROM {table} WHERE embedding IS NOT NULL LIMIT 1;")
+            result = cursor.fetchone()
+            return result[0] if result else 0
+        finally:
+            cursor.close()
+            conn.close()
+
+    def iter_table_chunks(self, dbname: str, table: str, date_format: str | None = None) -> Iterator[list[tuple]]:
+        """Stream rows of `SELECT_DOCUMENTS_QUERY` from `table` in chunks of `chunk_size`."""
+        # Connect to PostgreSQL
+        conn = postgres_connection(dbname)
+
+        # Check if the table exists
+        check_cursor = conn.cursor()
+        # Dates without an offset are UTC, see `date_epoch_sql`
+        check_cursor.execute("SET TIME ZONE 'UTC';")
+        check_cursor.execute("SELECT to_regclass(%s) IS NOT NULL;", (table,))
+        has_table = check_cursor.fetchone()[0]
+        check_cursor.close()
+
+        if not has_table:
+            logger.info(f"No {table} table found in {dbname}")
+            conn.close()
+            return
+
+        # A server-side cursor keeps only the current chunk in memory
+        cursor = conn.cursor(name=f"migrate_{table}", withhold=True)
+        cursor.itersize = self.chunk_size
+        try:
+            # Get documents from PostgreSQL (no platform_id filter since it's not stored)
+            with self.timed("query"):
+                cursor.execute(SELECT_DOCUMENTS_QUERY.format(table=table, date_ts=date_epoch_sql(date_format)))
+
+            while True:
+                rows = cursor.fetchmany(self.chunk_size)
+                if not rows:
+                    break
+                yield rows
+        finally:
+            cursor.close()
+            conn.close()
 
-                # Convert date in metadata to timestamp
-                metadata = self.convert_date_to_timestamp(metadata)
+    def table_counters(self, dbname: str, table: str) -> dict | None:
+        """Cumulative inserted, updated and deleted row counts of `table`.
 
-                # Create Document object
-                doc = Document(
-                    text=text,
-                    doc_id=node_id
-                )
-                
-                # Set metadata separately
-                if metadata:
-                    doc.metadata = metadata
-                
-                # Add the embedding if it exists
-                if embedding is not None:
-                    try:
-                        # Convert embedding from PostgreSQL format to list
-                        if isinstance(embedding, str):
-                            # If it's a string representation, parse it
-                            embedding_vector = ast.literal_eval(embedding)
-                        elif hasattr(embedding, 'tolist'):
-                            # If it's a numpy array or similar, convert to list
-                            embedding_vector = embedding.tolist()
-                        else:
-                            # If it's already a list/sequence, use as is
-                            embedding_vector = list(embedding)
-                        
-                        doc.embedding = embedding_vector
-                    except Exception as e:
-                        logger.warning(f"Could not parse embedding for document {node_id}: {e}")
-                    
-                documents.append(doc)
-            
+        Read from `pg_stat_user_tables`, so no table scan is needed. None if the
+        table does not exist.
+        """
+        conn = postgres_connection(dbname)
+        cursor = conn.cursor()
+        try:
+            cursor.execute(
+                """
+                SELECT n_tup_ins, n_tup_upd, n_tup_del
+                FROM pg_stat_user_tables
+                WHERE relid = to_regclass(%s);
+                """,
+                (table,),
+            )
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            return {"inserted": row[0], "updated": row[1], "deleted": row[2]}
+        finally:
             cursor.close()
-            postgres_instance.close_connection()
-            
-            logger.info(f"Retrieved {len(documents)} Discord documents")
-
-            logger.info("Starting Temporal client")
-            client = asyncio.run(TemporalClient().get_client())
-
-            logger.info("Starting to prepare batch documents!")
-            batch_documents: list[BatchDocument] = []
-            if not self.dry_run and documents:                
-                batch_documents.extend(
-                    [
-                        BatchDocument(
-                            docId=doc.doc_id, 
-                            text=doc.text, 
-                            metadata=doc.metadata, 
-                            excludedEmbedMetadataKeys=doc.metadata.get("excludedEmbedMetadataKeys", []), 
-                            excludedLlmMetadataKeys=doc.metadata.get("excludedLlmMetadataKeys", [])
-                        ) for doc in documents
-                    ]
-                )
+            conn.close()
 
-                logger.info("Starting to prepare temporal payloads!")
-                payload = BatchIngestionRequest(
-                    communityId=community_id,
-                    platformId=platform_id,
-                    document=batch_documents,
-                )
+    def spool_is_current(self, dbname: str, table: str) -> bool:
+        """Whether the spool of `table` can be reused instead of extracting it again.
 
-                logger.info("Starting to execute temporal workflow!")
-                asyncio.run(client.execute_workflow(
-                    "BatchVectorIngestionWorkflow",
-                    payload,
-                    id=f"migrations:IngestDiscord:{int(datetime.now().timestamp())}",
-                    task_queue="TEMPORAL_QUEUE_PYTHON_HEAVY",
-                ))
+        The spool is stale once `table` was written to after its extract,
+        judged by the write counters stored in the spool, or when
+        `refresh_spool` is set. A reset of the statistics also marks it stale.
+        """
+        community_id = dbname.replace("community_", "")
+        if not self.spool.exists(community_id, table):
+            return False
+        if self.refresh_spool:
+            logger.info(f"Refreshing spool of {table} in {dbname}")
+            return False
 
-                logger.info(f"Successfully migrated {len(documents)} Discord documents")
-            
-            self.processed_documents += len(documents)
+        with self.timed("spool_check"):
+            counters = self.table_counters(dbname, table)
+            current = counters is not None and counters == self.spool.counters(community_id, table)
+        if not current:
+            logger.info(f"Spool of {table} in {dbname} is out of date, extracting it again")
+        return current
+
+    def migrate_table(
+        self,
+        dbname: str,
+        platform_id: str,
+        table: str,
+        workflow_name: str,
+        collection_name: str | None = None,
+        date_format: str | None = None,
+    ) -> int:
+        """Stream `table` into Qdrant, one ingestion workflow per chunk of rows.
+
+        In dry-run mode the table is only planned, see `plan_table`. With a
+        spool the table is extracted from PostgreSQL once and every load,
+        including retries, reads the memory-mapped spool file instead, for as
+        long as the spool is current (see `spool_is_current`).
+
+        Returns
+        -------
+        count : int
+            The number of rows migrated (or that would be migrated).
+        """
+        if self.dry_run:
+            plan = self.plan_table(dbname, table)
+            self.log_plan(dbname, plan)
+            return plan["rows"]
+
+        community_id = dbname.replace("community_", "")
+
+        if self.spool is None:
+            chunks = self.iter_table_chunks(dbname, table, date_format)
+        else:
+            if not self.spool_is_current(dbname, table):
+                with self.timed("spool") as span:
+                    # Read before the extract, so writes during it make the spool stale
+                    counters = self.table_counters(dbname, table)
+                    spooled = self.spool.write_table(
+                        community_id,
+                        table,
+                        self.iter_table_chunks(dbname, table, date_format),
+                        dim=self.get_embedding_dim(dbname, table),
+                        counters=counters,
+                    )
+                    span.set_attribute("rows", spooled)
+                logger.info(f"Spooled {spooled} rows of {table} to {self.spool.path(community_id, table)}")
+            else:
+                logger.info(f"Loading {table} from existing spool {self.spool.path(community_id, table)}")
+            chunks = self.spool.read_chunks(community_id, table)
+
+        return self.submit_chunks(chunks, community_id, platform_id, table, workflow_name, collection_name)
+
+    def submit_chunks(
+        self,
+        chunks: Iterator[list[tuple]],
+        community_id: str,
+        platform_id: str,
+        table: str,
+        workflow_name: str,
+        collection_name: str | None = None,
+    ) -> int:
+        """Send each chunk of fetched rows to BatchVectorIngestionWorkflow.
+
+        With a fingerprint cache only new and changed rows are sent, so the
+        returned count is the number of rows actually submitted.
+        """
+        client = None
+        known = None
+        document_count = 0
+        chunk_index = 0
+        while True:
+            with tracer.start_as_current_span("chunk", attributes={"chunk.index": chunk_index}) as chunk_span:
+                with self.timed("fetch") as span:
+                    rows = next(chunks, [])
+                    span.set_attribute("rows", len(rows))
+                chunk_span.set_attribute("rows", len(rows))
+                if not rows:
+                    break
+
+                # Convert date in metadata to timestamp
+                with self.timed("date_conversion"):
+                    rows = self.convert_dates(rows)
+
+                if self.fingerprints is not None:
+                    with self.timed("fingerprint") as span:
+                        if known is None:
+                            known = self.fingerprints.load(f"{community_id}_{collection_name or platform_id}")
+                        fetched = len(rows)
+                        rows = self.skip_unchanged(rows, known)
+                        span.set_attribute("skipped", fetched - len(rows))
+                    chunk_span.set_attribute("rows", len(rows))
+                    if not rows:
+                        chunk_index += 1
+                        continue
+
+                if client is None:
+                    logger.info("Starting Temporal client")
+                    with self.timed("submit"):
+                        client = asyncio.run(TemporalClient().get_client())
+
+                with self.timed("model_build"):
+                    payload = build_ingestion_payload(
+                        community_id,
+                        platform_id,
+                        rows,
+                        collection_name=collection_name,
+                    )
+
+                if chunk_span.is_recording():
+                    # Only serialized twice when the span is actually exported
+                    chunk_span.set_attribute("bytes", len(json.dumps(payload).encode()))
+
+                if self.throttle is not None:
+                    with self.timed("throttle") as span:
+                        span.set_attribute("waited_s", asyncio.run(self.throttle.wait(client)))
+
+                with self.timed("submit"):
+                    asyncio.run(client.execute_workflow(
+                        "BatchVectorIngestionWorkflow",
+                        payload,
+                        id=f"migrations:{workflow_name}:{platform_id}:{chunk_index}:{int(datetime.now().timestamp())}",
+                        task_queue=self.task_queue,
+                    ))
+
+            document_count += len(rows)
+            chunk_index += 1
+            logger.info(f"Submitted chunk {chunk_index} of {table} ({document_count} rows so far)")
+
+        return document_count
+
+    def migrate_platform_table(
+        self,
+        dbname: str,
+        platform_id: str,
+        platform: PlatformConfig,
+        summary: bool = False,
+    ) -> bool:
+        """Migrate the documents (or summaries) of one platform from PostgreSQL to Qdrant."""
+        kind = "summaries" if summary else "documents"
+        table = platform.summary_table if summary else platform.table
+        if table is None:
             return True
-            
-        except Exception as e:
-            logger.error(f"Error migrating Discord documents: {e}")
-            return False
 
-    def migrate_discord_summaries(self, dbname: str, platform_id: str) -> bool:
-        """Migrate Discord summaries from PostgreSQL to Qdrant."""
         try:
             community_id = dbname.replace("community_", "")
             
-            logger.info(f"Migrating Discord summaries for community {community_id}, platform {platform_id}")
-            
-            # Connect to PostgreSQL
-            postgres_instance = PostgresSingleton(dbname=dbname)
-            conn = postgres_instance.get_connection()
-            cursor = conn.cursor()
-            
-            # Check if discord_summary table exists
-            cursor.execute("""
-                SELECT EXISTS (
-                    SELECT FROM information_schema.tables 
-                    WHERE table_name = 'data_discord_summary'
-                );
-            """)
-            
-            result = cursor.fetchone()
-            has_summary_table = result[0] if result else False
-            
-            if not has_summary_table:
-                logger.info(f"No Discord summary table found in {dbname}")
-                cursor.close()
-                postgres_instance.close_connection()
-                return True
-            
-            # Get summary documents from PostgreSQL
-            cursor.execute("""
-                SELECT node_id, text, metadata_, embedding
-                FROM data_discord_summary 
-                ORDER BY (metadata_->>'date')::timestamp;
-            """)
-            
-            documents: list[Document] = []
-            for row in cursor.fetchall():
-                node_id, text, metadata, embedding = row
-                
-                # Convert date in metadata to timestamp
-                metadata = self.convert_date_to_timestamp(metadata)
-
-                # Create Document object
-                doc = Document(
-                    text=text,
-                    doc_id=node_id
-                )
-                
-                # Set metadata separately
-                if metadata:
-                    doc.metadata = metadata
-                
-                # Add the embedding if it exists
-                if embedding is not None:
-                    try:
-                        # Convert embedding from PostgreSQL format to list
-                        if isinstance(embedding, str):
-                            # If it's a string representation, parse it
-                            embedding_vector = ast.literal_eval(embedding)
-                        elif hasattr(embedding, 'tolist'):
-                            # If it's a numpy array or similar, convert to list
-                            embedding_vector = embedding.tolist()
-                        else:
-                            # If it's already a list/sequence, use as is
-                            embedding_vector = list(embedding)
-                        
-                        doc.embedding = embedding_vector
-                    except Exception as e:
-                        logger.warning(f"Could not parse embedding for summary document {node_id}: {e}")
-                    
-                documents.append(doc)
-            
-            cursor.close()
-            postgres_instance.close_connection()
-            
-            logger.info(f"Retrieved {len(documents)} Discord summary documents")
-
-            client = asyncio.run(TemporalClient().get_client())
-
-            batch_documents: list[BatchDocument] = []
-            if not self.dry_run and documents:                
-                batch_documents.extend(
-                    [
-                        BatchDocument(
-                            docId=doc.doc_id, 
-                            text=doc.text, 
-                            metadata=doc.metadata, 
-                            excludedEmbedMetadataKeys=doc.metadata.get("excludedEmbedMetadataKeys", []), 
-                            excludedLlmMetadataKeys=doc.metadata.get("excludedLlmMetadataKeys", [])
-                        ) for doc in documents
-                    ]
+            logger.info(f"Migrating {platform.name} {kind} for community {community_id}, platform {platform_id}")
+            
+            with tracer.start_as_current_span(
+                "migrate_table",
+                attributes={"table": table, "community_id": community_id, "platform_id": platform_id},
+            ) as span:
+                document_count = self.migrate_table(
+                    dbname,
+                    platform_id,
+                    table=table,
+                    workflow_name=f"{platform.workflow_name}Summary" if summary else platform.workflow_name,
+                    collection_name=f"{platform_id}{platform.collection_suffix}" if summary else None,
+                    date_format=platform.date_format,
                 )
+                span.set_attribute("rows", document_count)
 
-                payload = BatchIngestionRequest(
-                    communityId=community_id,
-                    platformId=platform_id,
-                    collectionName=f"{platform_id}_summary",
-                    document=batch_documents,
-                )
-
-                asyncio.run(client.execute_workflow(
-                    "BatchVectorIngestionWorkflow",
-                    payload,
-                    id=f"migrations:IngestDiscordSummary:{int(datetime.now().timestamp())}",
-                    task_queue="TEMPORAL_QUEUE_PYTHON_HEAVY",
-                ))
-
-                logger.info(f"Successfully migrated {len(documents)} Discord summary documents")
+            if not self.dry_run:
+                logger.info(f"Successfully migrated {document_count} {platform.name} {kind} of {community_id}")
             
-            self.processed_summaries += len(documents)
+            with self.lock:
+                self.processed[(platform.name, kind)] += document_count
             return True
             
         except Exception as e:
-            logger.error(f"Error migrating Discord summaries: {e}")
+            logger.error(f"Error migrating {platform.name} {kind} of {dbname}: {e}")
             return False
 
+    def migrate_community(self, community_id: str, platforms: list[dict]) -> list[str] | None:
+        """Migrate all platforms of one community, one after another.
+
+        Returns
+        -------
+        collections : list[str] | None
+            The collections written to, or None if any platform failed.
+        """
+        dbname = f"community_{community_id}"
+        collections = []
+        success = True
+
+        for platform in platforms:
+            platform_id = platform["platform_id"]
+            config = self.platforms[platform["name"]]
+
+            with tracer.start_as_current_span(
+                "migrate_platform",
+                attributes={"community_id": community_id, "platform_id": platform_id, "platform": config.name},
+            ):
+                logger.info(f"Processing community: {community_id}, {config.name} platform: {platform_id}")
+            
+                # Check if the community database has data (planning covers this in dry-run)
+                if not self.dry_run and self.get_document_count(dbname, config.table) == 0:
+                    logger.info(f"No {config.name} documents found in community {community_id}")
+                    continue
+            
+                platform_success = self.migrate_platform_table(dbname, platform_id, config)
+                platform_success = self.migrate_platform_table(dbname, platform_id, config, summary=True) and platform_success
+            
+                if platform_success:
+                    collections.append(f"{community_id}_{platform_id}")
+                    if config.summary_table:
+                        collections.append(f"{community_id}_{platform_id}{config.collection_suffix}")
+                else:
+                    success = False
+
+        if success:
+            logger.info(f"Successfully migrated community {community_id}")
+            return collections
+        logger.error(f"Failed to migrate community {community_id}")
+        return None
+
     def run_migration(self):
-        """Run the complete migration process for all Discord platforms."""
-        logger.info("Starting Discord PostgreSQL to Qdrant migration for all platforms")
+        """Run the complete migration process for all platforms of the configured types.
+
+        Communities are migrated in parallel by `jobs` workers. The platforms
+        of one community share its database, so they run in the same worker.
+        """
+        logger.info(f"Starting PostgreSQL to Qdrant migration for {', '.join(self.platforms)} platforms")
         
         if self.dry_run:
-            logger.info("DRY RUN MODE - No data will be actually migrated")
+            logger.info("DRY RUN MODE - Planning from table statistics, no data will be read or migrated")
         
-        # Get all Discord platforms
-        platforms = self.get_discord_platforms()
+        platforms = self.get_platforms()
         
         if not platforms:
-            logger.info("No Discord platforms found")
+            logger.info("No platforms found")
             return True
         
+        communities = defaultdict(list)
+        for platform in platforms:
+            communities[platform["community_id"]].append(platform)
+        
         overall_success = True
+        migrated_collections = []
         
-        for platform in platforms:
-            community_id = platform["community_id"]
-            platform_id = platform["platform_id"]
-            
-            logger.info(f"Processing community: {community_id}, platform: {platform_id}")
-            
-            dbname = f"community_{community_id}"
-            
-            # Check if community database has Discord data
-            doc_count = self.get_discord_document_count(dbname)
-            if doc_count == 0:
-                logger.info(f"No Discord documents found in community {community_id}")
-                continue
-            
-            success = True
-            
-            # Migrate Discord documents
-            if not self.migrate_discord_documents(dbname, platform_id):
-                success = False
-                overall_success = False
-            
-            # Migrate Discord summaries
-            if not self.migrate_discord_summaries(dbname, platform_id):
-                success = False
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            futures = {
+                executor.submit(self.migrate_community, community_id, community_platforms): community_id
+                for community_id, community_platforms in communities.items()
+            }
+            for future in as_completed(futures):
+                try:
+                    collections = future.result()
+                except Exception as e:
+                    logger.error(f"Error migrating community {futures[future]}: {e}")
+                    collections = None
+                if collections is None:
+                    overall_success = False
+                else:
+                    migrated_collections.extend(collections)
+        
+        if self.payload_indexer and not self.dry_run and migrated_collections:
+            existing = {collection.name for collection in self.payload_indexer.client.get_collections().collections}
+            if not self.payload_indexer.run([name for name in migrated_collections if name in existing]):
                 overall_success = False
-            
-            if success:
-                logger.info(f"Successfully migrated community {community_id}")
-            else:
-                logger.error(f"Failed to migrate community {community_id}")
         
         # Summary
         logger.info("=" * 60)
         logger.info("MIGRATION SUMMARY")
         logger.info("=" * 60)
-        logger.info(f"Total platforms processed: {len(platforms)}")
+        logger.info(f"Total platforms processed: {len(platforms)} in {len(communities)} communities")
+        for name in self.platforms:
+            logger.info(
+                f"  {name:<10} {self.processed[(name, 'documents')]} documents, "
+                f"{self.processed[(name, 'summaries')]} summaries"
+            )
         logger.info(f"Total documents migrated: {self.processed_documents}")
         logger.info(f"Total summaries migrated: {self.processed_summaries}")
+        if self.fingerprints is not None and not self.dry_run:
+            logger.info(f"Total unchanged documents skipped: {self.skipped_documents}")
+        if self.throttle is not None and not self.dry_run:
+            logger.info(f"Time paused for {self.task_queue} backlog: {self.stage_timings['throttle']:.1f}s")
+        if self.dry_run:
+            logger.info(f"Projected on-disk size: {self.planned['total_bytes'] / 2**30:.2f} GiB")
+            logger.info(f"Projected payload size: {self.planned['payload_bytes'] / 2**30:.2f} GiB")
+            logger.info(f"Projected workflows ({self.chunk_size} rows each): {self.planned['workflows']}")
         
         if overall_success:
             logger.info("Migration completed successfully!")
@@ -440,21 +775,125 @@ class DiscordPGToQdrantMigrator:
         
         return overall_success
 
-
 def main():
     parser = argparse.ArgumentParser(
-        description="Migrate Discord data from PostgreSQL to Qdrant for all platforms"
+        description="Migrate platform data from PostgreSQL to Qdrant for all platforms"
     )
     parser.add_argument(
         "--dry-run",
         action="store_true",
-        help="Run in dry-run mode (don't actually migrate data)"
+        help="Run in dry-run mode (only plan the migration from table statistics)"
+    )
+    parser.add_argument(
+        "--platforms",
+        nargs="+",
+        choices=list(PLATFORMS),
+        default=os.getenv("MIGRATION_PLATFORMS", " ".join(PLATFORMS)).split(),
+        help="Platform types to migrate (default: all)"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=int(os.getenv("MIGRATION_COMMUNITY_JOBS", "4")),
+        help="Communities migrated in parallel"
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=int(os.getenv("MIGRATION_CHUNK_SIZE", "1000")),
+        help="Rows sent per ingestion workflow"
+    )
+    
+    parser.add_argument(
+        "--task-queue",
+        default=os.getenv("MIGRATION_TASK_QUEUE", DEFAULT_TASK_QUEUE),
+        help="Temporal task queue of the ingestion workflows (e.g. a dedicated migration queue)"
+    )
+    parser.add_argument(
+        "--max-backlog",
+        type=int,
+        default=int(os.getenv("MIGRATION_MAX_BACKLOG", "50")),
+        help="Pause submitting while more tasks than this are queued (slows down from half of it)"
+    )
+    parser.add_argument(
+        "--max-backlog-age",
+        type=float,
+        default=float(os.getenv("MIGRATION_MAX_BACKLOG_AGE", "30")),
+        help="Pause submitting while the oldest queued task is older than this many seconds"
+    )
+    parser.add_argument(
+        "--max-pause",
+        type=float,
+        default=float(os.getenv("MIGRATION_MAX_PAUSE", "1800")),
+        help="Fail the table after pausing this many seconds in a row (0 waits indefinitely)"
+    )
+    parser.add_argument(
+        "--no-throttle",
+        action="store_true",
+        help="Submit without checking the task queue backlog"
+    )
+    
+    parser.add_argument(
+        "--create-payload-indexes",
+        action="store_true",
+        help="Create payload indexes (date, author_id, channel, thread) on the migrated collections"
+    )
+    
+    parser.add_argument(
+        "--refresh-spool",
+        action="store_true",
+        help="Extract every table into the spool again instead of reusing current spool files"
+    )
+    
+    parser.add_argument(
+        "--resend-all",
+        action="store_true",
+        help="Send every document, including those already in Qdrant with the same fingerprint"
+    )
+    
+    parser.add_argument(
+        "--spool-dir",
+        default=os.getenv("MIGRATION_SPOOL_DIR"),
+        help="Spool extracted rows to Arrow files here and load from them (reused on reruns)"
     )
     
     args = parser.parse_args()
     
-    migrator = DiscordPGToQdrantMigrator(dry_run=args.dry_run)
+    unknown = [name for name in args.platforms if name not in PLATFORMS]
+    if unknown:
+        parser.error(f"unknown platform(s) {', '.join(unknown)}, expected some of {', '.join(PLATFORMS)}")
+    
+    payload_indexer = None
+    if args.create_payload_indexes:
+        payload_indexer = PayloadIndexProvisioner(get_qdrant_client())
+    
+    throttle = None
+    if not args.no_throttle:
+        throttle = TaskQueueThrottle(
+            args.task_queue,
+            max_backlog=args.max_backlog,
+            max_backlog_age=args.max_backlog_age,
+            max_pause=args.max_pause or None,
+        )
+    
+    fingerprints = None
+    if not args.resend_all and not args.dry_run:
+        fingerprints = FingerprintCache(get_qdrant_client())
+    
+    migrator = PGVectorToQdrantMigrator(
+        platforms=[PLATFORMS[name] for name in args.platforms],
+        dry_run=args.dry_run,
+        chunk_size=args.chunk_size,
+        jobs=args.jobs,
+        payload_indexer=payload_indexer,
+        spool=ArrowSpool(args.spool_dir) if args.spool_dir else None,
+        refresh_spool=args.refresh_spool,
+        task_queue=args.task_queue,
+        throttle=throttle,
+        fingerprints=fingerprints,
+    )
     
+    setup_tracing("discord-migration")
     try:
         success = migrator.run_migration()
         sys.exit(0 if success else 1)
@@ -464,6 +903,8 @@ def main():
     except Exception as e:
         logger.error(f"Migration failed: {e}")
         sys.exit(1)
+    finally:
+        shutdown_tracing()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Payload index provisioning for migrated Qdrant collections.
+
+The migration stores `metadata['date']` as a float timestamp so hivemind can
+range-filter on it, but without a payload index every filtered query scans
+payloads. This script creates float/keyword payload indexes on the commonly
+filtered fields and reports the latency of a date-filtered query before and
+after.
+
+It runs as a post-migration step of V002 (`--create-payload-indexes`) or
+standalone on existing collections named `<community>_<platform>[_summary]`.
+
+Usage:
+    python V002_payload_indexes.py [--collections NAME ...] [--keyword-fields FIELD ...] [--float-fields FIELD ...]
+"""
+import argparse
+import logging
+import os
+import re
+import statistics
+import sys
+import time
+
+from dotenv import load_dotenv
+from qdrant_client import QdrantClient
+from qdrant_client.http import models as rest
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+# Same collection naming as V001: <communityId>_<platformId>[_summary]
+COLLECTION_PATTERN = r"^([^_]+)_([^_]+)(?:_summary)?$"
+DEFAULT_FLOAT_FIELDS = ["date"]
+DEFAULT_KEYWORD_FIELDS = ["author_id", "channel", "thread"]
+
+
+def get_qdrant_client() -> QdrantClient:
+    return QdrantClient(
+        host=os.getenv("QDRANT_HOST", "localhost"),
+        port=int(os.getenv("QDRANT_PORT", "6333")),
+        https=os.getenv("QDRANT_USE_HTTPS", "false").lower() == "true",
+        api_key=os.getenv("QDRANT_API_KEY") or None,
+    )
+
+
+class PayloadIndexProvisioner:
+    def __init__(
+        self,
+        client: QdrantClient,
+        float_fields: list[str] = DEFAULT_FLOAT_FIELDS,
+        keyword_fields: list[str] = DEFAULT_KEYWORD_FIELDS,
+        samples: int = 20,
+        days: int = 30,
+    ):
+        self.client = client
+        self.float_fields = float_fields
+        self.keyword_fields = keyword_fields
+        self.samples = samples
+        self.days = days
+
+    def measure_latency(self, collection_name: str) -> float | None:
+        """Median latency in ms of a vector query filtered to the last `days` days."""
+        records, _ = self.client.scroll(
+            collection_name=collection_name,
+            limit=1,
+            with_payload=False,
+            with_vectors=True,
+        )
+        if not records:
+            return None
+
+        vector = records[0].vector
+        using = None
+        if isinstance(vector, dict):
+            using, vector = next(iter(vector.items()))
+
+        date_filter = rest.Filter(must=[
+            rest.FieldCondition(
+                key="date",
+                range=rest.Range(gte=time.time() - self.days * 86400),
+            )
+        ])
+
+        latencies = []
+        for _ in range(self.samples):
+            start = time.perf_counter()
+            self.client.query_points(
+                collection_name=collection_name,
+                query=vector,
+                using=using,
+                query_filter=date_filter,
+                limit=10,
+            )
+            latencies.append((time.perf_counter() - start) * 1000)
+        return statistics.median(latencies)
+
+    def provision(self, collection_name: str) -> dict:
+        """Create the missing payload indexes of a collection and measure the effect."""
+        existing = self.client.get_collection(collection_name).payload_schema or {}
+        wanted = {field: rest.PayloadSchemaType.FLOAT for field in self.float_fields}
+        wanted.update({field: rest.PayloadSchemaType.KEYWORD for field in self.keyword_fields})
+        missing = {field: schema for field, schema in wanted.items() if field not in existing}
+
+        result = {
+            "collection": collection_name,
+            "created": list(missing),
+            "before_ms": None,
+            "after_ms": None,
+        }
+        if not missing:
+            logger.info(f"{collection_name}: all payload indexes already exist")
+            return result
+
+        result["before_ms"] = self.measure_latency(collection_name)
+        for field, schema in missing.items():
+            self.client.create_payload_index(
+                collection_name=collection_name,
+                field_name=field,
+                field_schema=schema,
+                wait=True,
+            )
+        result["after_ms"] = self.measure_latency(collection_name)
+
+        if result["before_ms"] is None:
+            logger.info(f"{collection_name}: created indexes on {', '.join(missing)} (empty collection)")
+        else:
+            logger.info(
+                f"{collection_name}: created indexes on {', '.join(missing)}, "
+                f"date-filtered query {result['before_ms']:.1f}ms -> {result['after_ms']:.1f}ms"
+            )
+        return result
+
+    def run(self, collection_names: list[str]) -> bool:
+        """Provision every collection and log a summary; returns False if any failed."""
+        success = True
+        results = []
+        for name in collection_names:
+            try:
+                results.append(self.provision(name))
+            except Exception as e:
+                logger.error(f"Error creating payload indexes for {name}: {e}")
+                success = False
+
+        logger.info("=" * 60)
+        logger.info("PAYLOAD INDEX SUMMARY")
+        logger.info("=" * 60)
+        logger.info(f"Collections processed: {len(results)}")
+        logger.info(f"Indexes created: {sum(len(result['created']) for result in results)}")
+        measured = [result for result in results if result["before_ms"] is not None]
+        if measured:
+            before = statistics.median(result["before_ms"] for result in measured)
+            after = statistics.median(result["after_ms"] for result in measured)
+            logger.info(f"Median date-filtered query latency: {before:.1f}ms -> {after:.1f}ms")
+        return success
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Create payload indexes on migrated Qdrant collections"
+    )
+    parser.add_argument(
+        "--collections",
+        nargs="+",
+        help="Collections to index (default: all matching <community>_<platform>[_summary])"
+    )
+    parser.add_argument("--float-fields", nargs="*", default=DEFAULT_FLOAT_FIELDS, help="Fields given a float index")
+    parser.add_argument("--keyword-fields", nargs="*", default=DEFAULT_KEYWORD_FIELDS, help="Fields given a keyword index")
+    parser.add_argument("--samples", type=int, default=20, help="Queries per latency measurement")
+    parser.add_argument("--days", type=int, default=30, help="Date range of the measured query")
+
+    args = parser.parse_args()
+
+    client = get_qdrant_client()
+    collection_names = args.collections
+    if not collection_names:
+        collection_names = [
+            collection.name
+            for collection in client.get_collections().collections
+            if re.match(COLLECTION_PATTERN, collection.name)
+        ]
+
+    provisioner = PayloadIndexProvisioner(
+        client,
+        float_fields=args.float_fields,
+        keyword_fields=args.keyword_fields,
+        samples=args.samples,
+        days=args.days,
+    )
+
+    try:
+        success = provisioner.run(collection_names)
+        sys.exit(0 if success else 1)
+    except KeyboardInterrupt:
+        logger.info("Payload index provisioning interrupted by user")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
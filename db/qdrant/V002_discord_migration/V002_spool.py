@@ -0,0 +1,128 @@
+"""
+Local columnar spool between the PostgreSQL extract and the Qdrant/Temporal load.
+
+Each community table is written once to `<spool_dir>/<community_id>/<table>.arrow`
+as an uncompressed Arrow IPC file, one record batch per chunk, with the
+embeddings as a fixed-width float32 column. Reading memory-maps the file, so
+loads can be retried, parallelized or benchmarked from the spool without
+copying the data again or putting any further load on PostgreSQL.
+
+Each file records the table's `pg_stat_user_tables` write counters from
+before its extract in the schema metadata (see `counters`). A spool is only
+reused while they still match the table's, so checking it never scans the table.
+"""
+import json
+import os
+from typing import Iterable, Iterator
+
+import numpy as np
+import pyarrow as pa
+
+# Schema metadata key of the table's write counters at extract time
+COUNTERS_KEY = b"table_counters"
+
+
+def spool_schema(dim: int) -> pa.Schema:
+    return pa.schema([
+        ("node_id", pa.string()),
+        ("text", pa.string()),
+        ("metadata", pa.string()),
+        ("embedding", pa.list_(pa.float32(), dim)),
+        ("date_ts", pa.float64()),
+    ])
+
+
+def parse_pgvector(embedding) -> np.ndarray:
+    """Decode a pgvector value (text '[1,2,3]' or a sequence) to float32."""
+    if isinstance(embedding, str):
+        # Parsed in C without building a list of Python strings
+        return np.fromstring(embedding.strip("[]"), sep=",", dtype=np.float32)
+    return np.asarray(embedding, dtype=np.float32)
+
+
+class ArrowSpool:
+    def __init__(self, spool_dir: str):
+        self.spool_dir = spool_dir
+
+    def path(self, community_id: str, table: str) -> str:
+        return os.path.join(self.spool_dir, community_id, f"{table}.arrow")
+
+    def exists(self, community_id: str, table: str) -> bool:
+        return os.path.exists(self.path(community_id, table))
+
+    def to_record_batch(self, rows: list[tuple], dim: int) -> pa.RecordBatch:
+        """Convert fetched `(node_id, text, metadata_, embedding, date_ts)` rows to a record batch."""
+        node_ids, texts, metadata, embeddings, date_ts = zip(*rows)
+
+        vectors = [None if e is None else parse_pgvector(e) for e in embeddings]
+        if all(vector is not None for vector in vectors):
+            flat = pa.array(np.concatenate(vectors) if vectors else np.empty(0, np.float32))
+            embedding_array = pa.FixedSizeListArray.from_arrays(flat, dim)
+        else:
+            embedding_array = pa.array(vectors, type=pa.list_(pa.float32(), dim))
+
+        return pa.RecordBatch.from_arrays(
+            [
+                pa.array(node_ids, type=pa.string()),
+                pa.array(texts, type=pa.string()),
+                pa.array([json.dumps(m) for m in metadata], type=pa.string()),
+                embedding_array,
+                pa.array(date_ts, type=pa.float64()),
+            ],
+            schema=spool_schema(dim),
+        )
+
+    def write_table(
+        self,
+        community_id: str,
+        table: str,
+        chunks: Iterable[list[tuple]],
+        dim: int,
+        counters: dict | None = None,
+    ) -> int:
+        """Write all chunks of a table; the file only appears once it is complete.
+
+        `counters` are the table's write counters read before the extract.
+        """
+        path = self.path(community_id, table)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+
+        schema = spool_schema(dim).with_metadata({COUNTERS_KEY: json.dumps(counters)})
+        count = 0
+        with pa.OSFile(tmp_path, "wb") as sink:
+            with pa.ipc.new_file(sink, schema) as writer:
+                for rows in chunks:
+                    writer.write_batch(self.to_record_batch(rows, dim))
+                    count += len(rows)
+        os.replace(tmp_path, path)
+        return count
+
+    def counters(self, community_id: str, table: str) -> dict | None:
+        """Write counters recorded in a spool file's footer, None if it has none."""
+        with pa.memory_map(self.path(community_id, table), "r") as source:
+            metadata = pa.ipc.open_file(source).schema.metadata or {}
+        return json.loads(metadata[COUNTERS_KEY]) if COUNTERS_KEY in metadata else None
+
+    def read_chunks(self, community_id: str, table: str) -> Iterator[list[tuple]]:
+        """Yield the spooled chunks as rows, with embeddings as zero-copy views into the file.
+
+        The views keep the mapped region alive after the file is closed.
+        """
+        with pa.memory_map(self.path(community_id, table), "r") as source:
+            reader = pa.ipc.open_file(source)
+            dim = reader.schema.field("embedding").type.list_size
+            for i in range(reader.num_record_batches):
+                batch = reader.get_batch(i)
+                embedding_column = batch.column("embedding")
+                if embedding_column.null_count == 0:
+                    embeddings = embedding_column.flatten().to_numpy(zero_copy_only=True).reshape(-1, dim)
+                else:
+                    embeddings = [None if e is None else np.asarray(e, np.float32) for e in embedding_column.to_pylist()]
+                yield list(zip(
+                    batch.column("node_id").to_pylist(),
+                    batch.column("text").to_pylist(),
+                    [json.loads(m) for m in batch.column("metadata").to_pylist()],
+                    embeddings,
+                    batch.column("date_ts").to_pylist(),
+                ))
@@ -0,0 +1,135 @@
+"""
+Adaptive throttling of migration workflows on a shared Temporal task queue.
+
+Live hivemind ingestion and the migration both run on the Python heavy task
+queue. Before each submission the migrator asks Temporal for the queue's
+backlog (`describe_task_queue`) and backs off while production work is
+waiting: submissions slow down linearly once the backlog passes half of
+`max_backlog`, and pause entirely above it, when the oldest task has waited
+longer than `max_backlog_age` seconds, or when no worker polls the queue.
+A pause is logged every `log_interval` seconds, and one lasting longer than
+`max_pause` seconds raises `TimeoutError`, failing the table being migrated.
+"""
+import asyncio
+import logging
+
+from temporalio.api.enums.v1 import TaskQueueType
+from temporalio.api.taskqueue.v1 import TaskQueue
+from temporalio.api.workflowservice.v1 import DescribeTaskQueueRequest
+from temporalio.client import Client
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TASK_QUEUE = "TEMPORAL_QUEUE_PYTHON_HEAVY"
+
+
+class TaskQueueThrottle:
+    def __init__(
+        self,
+        task_queue: str = DEFAULT_TASK_QUEUE,
+        max_backlog: int = 50,
+        max_backlog_age: float = 30.0,
+        poll_interval: float = 5.0,
+        max_pause: float | None = 1800.0,
+        log_interval: float = 60.0,
+    ):
+        self.task_queue = task_queue
+        self.max_backlog = max_backlog
+        self.max_backlog_age = max_backlog_age
+        self.poll_interval = poll_interval
+        # Longest single pause before giving up (None waits indefinitely)
+        self.max_pause = max_pause
+        self.log_interval = log_interval
+        # Set once describe_task_queue failed, e.g. for lack of permissions
+        self.disabled = False
+
+    async def describe(self, client: Client) -> dict:
+        """Backlog of the queue over workflow and activity tasks.
+
+        Returns
+        -------
+        status : dict
+            `backlog` (tasks), `backlog_age` (seconds of the oldest task) and
+            `pollers` (workers polling both task types).
+        """
+        status = {"backlog": 0, "backlog_age": 0.0, "pollers": None}
+        for task_queue_type in (TaskQueueType.TASK_QUEUE_TYPE_WORKFLOW, TaskQueueType.TASK_QUEUE_TYPE_ACTIVITY):
+            response = await client.workflow_service.describe_task_queue(
+                DescribeTaskQueueRequest(
+                    namespace=client.namespace,
+                    task_queue=TaskQueue(name=self.task_queue),
+                    task_queue_type=task_queue_type,
+                    report_stats=True,
+                    # Older servers only fill in the backlog hint
+                    include_task_queue_status=True,
+                )
+            )
+            backlog = max(
+                response.stats.approximate_backlog_count,
+                response.task_queue_status.backlog_count_hint,
+            )
+            status["backlog"] = max(status["backlog"], backlog)
+            status["backlog_age"] = max(
+                status["backlog_age"],
+                response.stats.approximate_backlog_age.ToTimedelta().total_seconds(),
+            )
+            pollers = len(response.pollers)
+            status["pollers"] = pollers if status["pollers"] is None else min(status["pollers"], pollers)
+        return status
+
+    def delay(self, status: dict) -> float | None:
+        """Seconds to wait before the next submission, or None to pause and check again."""
+        if status["pollers"] == 0:
+            return None
+        if status["backlog"] > self.max_backlog or status["backlog_age"] > self.max_backlog_age:
+            return None
+        low = self.max_backlog / 2
+        if status["backlog"] <= low:
+            return 0.0
+        return self.poll_interval * (status["backlog"] - low) / (self.max_backlog - low)
+
+    async def wait(self, client: Client) -> float:
+        """Block until the queue has room for another submission.
+
+        Returns
+        -------
+        waited : float
+            Seconds spent waiting.
+        """
+        waited = 0.0
+        paused = False
+        last_log = 0.0
+        while not self.disabled:
+            try:
+                status = await self.describe(client)
+            except Exception as e:
+                logger.warning(f"Cannot describe task queue {self.task_queue}, throttling disabled: {e}")
+                self.disabled = True
+                break
+
+            delay = self.delay(status)
+            if delay is None:
+                reason = (
+                    f"{self.task_queue} has {status['backlog']} queued tasks "
+                    f"(oldest {status['backlog_age']:.0f}s, {status['pollers']} pollers)"
+                )
+                if self.max_pause is not None and waited >= self.max_pause:
+                    raise TimeoutError(f"Submissions paused for {waited:.0f}s, giving up: {reason}")
+                if not paused:
+                    logger.info(f"Pausing submissions: {reason}")
+                    paused = True
+                    last_log = waited
+                elif waited - last_log >= self.log_interval:
+                    logger.info(f"Still paused after {waited:.0f}s: {reason}")
+                    last_log = waited
+                await asyncio.sleep(self.poll_interval)
+                waited += self.poll_interval
+                continue
+
+            if paused:
+                logger.info(f"Resuming submissions after {waited:.0f}s ({status['backlog']} queued tasks)")
+            if delay > 0:
+                await asyncio.sleep(delay)
+                waited += delay
+            break
+        return waited
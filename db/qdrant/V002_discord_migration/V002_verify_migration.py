@@ -17,6 +17,8 @@ from typing import Dict, List
 from tc_hivemind_backend.db.postgresql import PostgresSingleton
 from tc_hivemind_backend.ingest_qdrant import CustomIngestionPipeline
 from dotenv import load_dotenv
+from opentelemetry import trace
+from tracing import setup_tracing, shutdown_tracing
 
 # Configure logging
 logging.basicConfig(
@@ -24,6 +26,7 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
+tracer = trace.get_tracer(__name__)
 
 load_dotenv()
 
@@ -159,10 +162,14 @@ class DiscordMigrationVerifier:
         dbname = f"community_{community_id}"
         
         # Get counts from PostgreSQL
-        pg_counts = self.get_pg_counts(dbname)
+        with tracer.start_as_current_span("query", attributes={"source": "postgresql"}) as span:
+            pg_counts = self.get_pg_counts(dbname)
+            span.set_attribute("rows", sum(pg_counts.values()))
         
         # Get counts from Qdrant
-        qdrant_counts = self.get_qdrant_counts(community_id, platform_id)
+        with tracer.start_as_current_span("query", attributes={"source": "qdrant"}) as span:
+            qdrant_counts = self.get_qdrant_counts(community_id, platform_id)
+            span.set_attribute("rows", sum(qdrant_counts.values()))
         
         # Extract counts
         pg_discord_count = pg_counts.get('discord', 0)
@@ -194,7 +201,12 @@ class DiscordMigrationVerifier:
         logger.info("Starting Discord migration verification")
         
         try:
-            result = self.verify_community(community_id, platform_id, detailed)
+            with tracer.start_as_current_span(
+                "verify_platform",
+                attributes={"community_id": community_id, "platform_id": platform_id},
+            ) as span:
+                result = self.verify_community(community_id, platform_id, detailed)
+                span.set_attribute("success", result['success'])
             self.verification_results.append(result)
             
             # Log result
@@ -258,6 +270,7 @@ def main():
     
     verifier = DiscordMigrationVerifier()
     
+    setup_tracing("discord-migration-verifier")
     try:
         success = verifier.run_verification(args.community_id, args.platform_id, args.detailed)
         sys.exit(0 if success else 1)
@@ -267,6 +280,8 @@ def main():
     except Exception as e:
         logger.error(f"Verification failed: {e}")
         sys.exit(1)
+    finally:
+        shutdown_tracing()
 
 
 if __name__ == "__main__":
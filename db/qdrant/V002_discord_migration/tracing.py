@@ -0,0 +1,41 @@
+"""
+OpenTelemetry tracing for the V002 migration scripts.
+
+Spans are exported over OTLP to the `otel-collector` service, which forwards
+them to Tempo, when `OTEL_EXPORTER_OTLP_ENDPOINT` is set (e.g.
+`http://otel-collector:4317`). Without it no tracer provider is installed and
+every span is a no-op.
+"""
+import os
+
+from opentelemetry import trace
+from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+
+def setup_tracing(service_name: str) -> bool:
+    """Install an OTLP-exporting tracer provider if an endpoint is configured.
+
+    Returns
+    -------
+    enabled : bool
+        Whether spans will be exported.
+    """
+    if not os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT"):
+        return False
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": os.getenv("OTEL_SERVICE_NAME", service_name)})
+    )
+    provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+    trace.set_tracer_provider(provider)
+    return True
+
+
+def shutdown_tracing():
+    """Flush pending spans before the process exits."""
+    provider = trace.get_tracer_provider()
+    if hasattr(provider, "shutdown"):
+        provider.shutdown()
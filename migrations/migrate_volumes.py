@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Parallel, incremental Docker volume migration.
+
+Copies named Docker volumes into their `compose_<volume>` counterparts using
+rsync inside a throw-away container. Volumes are copied concurrently (bounded
+by `--jobs`), reruns only transfer what changed since the previous run, and
+every volume is verified with a checksum pass once the copy is done.
+
+With `--remote` the source volumes live on another server. They are first
+pulled over SSH into a local staging directory (again incrementally), which is
+then synced into the target volume. The pull runs as root (through sudo) so
+the staged files keep their owners. sudo asks for its password once, before
+any copy starts; the parallel pulls never prompt.
+
+Every rsync call passes `--numeric-ids`: owners are copied as uid/gid rather
+than mapped by user name, since e.g. the postgres uid of the database images
+rarely exists on the host.
+
+Usage:
+    python migrate_volumes.py --source-prefix production VOLUME [VOLUME ...]
+    python migrate_volumes.py --source-prefix development --remote USER@HOST \
+        --pem KEY.pem --staging-dir ./backup VOLUME [VOLUME ...]
+"""
+import argparse
+import logging
+import os
+import re
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+RSYNC_IMAGE = os.getenv("MIGRATION_RSYNC_IMAGE", "instrumentisto/rsync-ssh")
+REMOTE_VOLUME_ROOT = "/var/lib/docker/volumes"
+# Owners must survive every hop unchanged, see the module docstring
+RSYNC_BASE_FLAGS = ["-a", "--numeric-ids", "--delete"]
+
+
+def parse_rsync_stats(output: str) -> dict:
+    """Extract the byte counters we report on from `rsync --stats` output."""
+    stats = {"total_bytes": 0, "transferred_bytes": 0}
+    patterns = {
+        "total_bytes": r"Total file size: ([\d,]+)",
+        "transferred_bytes": r"Total transferred file size: ([\d,]+)",
+    }
+    for key, pattern in patterns.items():
+        match = re.search(pattern, output)
+        if match:
+            stats[key] = int(match.group(1).replace(",", ""))
+    return stats
+
+
+def format_bytes(size: float) -> str:
+    for unit in ["B", "KiB", "MiB", "GiB"]:
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TiB"
+
+
+class VolumeMigrator:
+    def __init__(
+        self,
+        source_prefix: str,
+        target_prefix: str = "compose",
+        remote: str | None = None,
+        pem: str | None = None,
+        staging_dir: str = "./backup",
+        verify: bool = True,
+    ):
+        self.source_prefix = source_prefix
+        self.target_prefix = target_prefix
+        self.remote = remote
+        self.pem = os.path.abspath(pem) if pem else None
+        self.staging_dir = os.path.abspath(staging_dir)
+        self.verify = verify
+
+    def _run(self, command: list[str]) -> str:
+        result = subprocess.run(command, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(
+                f"Command failed ({result.returncode}): {' '.join(command)}\n{result.stderr}"
+            )
+        return result.stdout
+
+    def _ssh_command(self) -> str:
+        command = "ssh -o StrictHostKeyChecking=accept-new"
+        if self.pem:
+            command += f" -i {self.pem}"
+        return command
+
+    def _volume_rsync(self, source_mount: list[str], target_volume: str, flags: list[str]) -> str:
+        """Run rsync from `/source` to `/target` inside a container."""
+        return self._run([
+            "docker", "run", "--rm",
+            *source_mount,
+            "-v", f"{target_volume}:/target",
+            RSYNC_IMAGE,
+            "rsync", *flags, "/source/", "/target/",
+        ])
+
+    def _remote_rsync(self, volume: str, flags: list[str]) -> str:
+        """Run rsync from the remote volume into the local staging directory."""
+        source_path = f"{REMOTE_VOLUME_ROOT}/{self.source_prefix}_{volume}/_data/"
+        target_path = os.path.join(self.staging_dir, volume) + "/"
+        os.makedirs(target_path, exist_ok=True)
+        # Without root the staged files would be owned by the operator. Non-interactive:
+        # main() authenticated up front, and parallel pulls must not prompt at once
+        sudo = [] if os.geteuid() == 0 else ["sudo", "-n"]
+        return self._run([
+            *sudo, "rsync", *flags,
+            "-e", self._ssh_command(),
+            "--rsync-path", "sudo rsync",
+            f"{self.remote}:{source_path}", target_path,
+        ])
+
+    def _source_mount(self, volume: str) -> list[str]:
+        if self.remote:
+            return ["-v", f"{os.path.join(self.staging_dir, volume)}:/source:ro"]
+        return ["-v", f"{self.source_prefix}_{volume}:/source:ro"]
+
+    def _verify(self, volume: str) -> bool:
+        """Checksum-compare source and target; any itemized change is a mismatch."""
+        flags = [*RSYNC_BASE_FLAGS, "--checksum", "--dry-run", "--itemize-changes"]
+        target_volume = f"{self.target_prefix}_{volume}"
+
+        differences = ""
+        if self.remote:
+            differences += self._remote_rsync(volume, flags)
+        differences += self._volume_rsync(self._source_mount(volume), target_volume, flags)
+        return differences.strip() == ""
+
+    def migrate_volume(self, volume: str) -> dict:
+        """Sync a single volume and return its transfer statistics."""
+        target_volume = f"{self.target_prefix}_{volume}"
+        flags = [*RSYNC_BASE_FLAGS, "--stats"]
+
+        logger.info(f"Migrating {volume} -> {target_volume}")
+        start = time.monotonic()
+
+        if self.remote:
+            self._remote_rsync(volume, flags)
+        output = self._volume_rsync(self._source_mount(volume), target_volume, flags)
+
+        elapsed = time.monotonic() - start
+        stats = parse_rsync_stats(output)
+        stats["volume"] = volume
+        stats["elapsed"] = elapsed
+        stats["throughput"] = stats["transferred_bytes"] / elapsed if elapsed > 0 else 0.0
+        stats["verified"] = self._verify(volume) if self.verify else None
+
+        logger.info(
+            f"Completed {volume}: {format_bytes(stats['transferred_bytes'])} of "
+            f"{format_bytes(stats['total_bytes'])} transferred in {elapsed:.1f}s "
+            f"({format_bytes(stats['throughput'])}/s)"
+        )
+        return stats
+
+    def run_migration(self, volumes: list[str], jobs: int) -> bool:
+        """Migrate all volumes with at most `jobs` copies running at once."""
+        results = []
+        failed = []
+
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            futures = {executor.submit(self.migrate_volume, volume): volume for volume in volumes}
+            for future in as_completed(futures):
+                volume = futures[future]
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    logger.error(f"Error migrating volume {volume}: {e}")
+                    failed.append(volume)
+
+        # Summary
+        logger.info("=" * 60)
+        logger.info("VOLUME MIGRATION SUMMARY")
+        logger.info("=" * 60)
+        for stats in sorted(results, key=lambda item: item["volume"]):
+            verified = {True: "OK", False: "MISMATCH", None: "skipped"}[stats["verified"]]
+            logger.info(
+                f"{stats['volume']}: {format_bytes(stats['transferred_bytes'])} in "
+                f"{stats['elapsed']:.1f}s ({format_bytes(stats['throughput'])}/s), checksum {verified}"
+            )
+            if stats["verified"] is False:
+                failed.append(stats["volume"])
+        for volume in failed:
+            logger.error(f"Volume {volume} failed to migrate")
+
+        return not failed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Copy Docker volumes into compose volumes in parallel using rsync"
+    )
+    parser.add_argument("volumes", nargs="+", help="Volume names without prefix")
+    parser.add_argument(
+        "--source-prefix",
+        required=True,
+        help="Prefix of the source volumes (e.g. production, monitoring, development)"
+    )
+    parser.add_argument(
+        "--target-prefix",
+        default="compose",
+        help="Prefix of the target volumes"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=int(os.getenv("MIGRATION_JOBS", "3")),
+        help="Maximum number of volumes copied concurrently"
+    )
+    parser.add_argument(
+        "--remote",
+        help="SSH destination holding the source volumes (e.g. ubuntu@host)"
+    )
+    parser.add_argument("--pem", help="SSH private key for --remote")
+    parser.add_argument(
+        "--staging-dir",
+        default="./backup",
+        help="Local directory the remote volumes are synced into"
+    )
+    parser.add_argument(
+        "--no-verify",
+        action="store_true",
+        help="Skip the checksum verification pass"
+    )
+
+    args = parser.parse_args()
+
+    if args.remote and os.geteuid() != 0:
+        logger.info("The remote pull runs rsync through sudo, authenticating once")
+        if subprocess.run(["sudo", "-v"]).returncode != 0:
+            logger.error("sudo authentication failed; run as root or with sudo rights")
+            sys.exit(1)
+
+    migrator = VolumeMigrator(
+        source_prefix=args.source_prefix,
+        target_prefix=args.target_prefix,
+        remote=args.remote,
+        pem=args.pem,
+        staging_dir=args.staging_dir,
+        verify=not args.no_verify,
+    )
+
+    try:
+        success = migrator.run_migration(args.volumes, max(1, args.jobs))
+        sys.exit(0 if success else 1)
+    except KeyboardInterrupt:
+        logger.info("Migration interrupted by user")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -18,25 +18,11 @@ monitoring_volumes=(
   loki_volume
 )
 
-run() {
-  volume=$1
-  prepend=$2
-  echo "######################################"
-  echo Migrating $volume
-  docker run --rm -v "${prepend}_${volume}":/source:ro -v compose_$volume:/target ubuntu cp -av source/. target
-  echo Completed
-}
+script_dir="$(cd "$(dirname "$0")" && pwd)"
 
-length=${#monitoring_volumes[@]}
-for ((i=0; i<length; i++)); do
-  volume=${monitoring_volumes[$i]}
-  run $volume "monitoring"
-done
-
-length=${#production_volumes[@]}
-for ((i=0; i<length; i++)); do
-  volume=${production_volumes[$i]}
-  run $volume "production"
-done
+# Volumes are copied in parallel (MIGRATION_JOBS, default 3) with rsync, so
+# reruns only transfer changes. Each volume is checksum-verified at the end.
+python3 "$script_dir/migrate_volumes.py" --source-prefix monitoring "${monitoring_volumes[@]}" || exit 1
+python3 "$script_dir/migrate_volumes.py" --source-prefix production "${production_volumes[@]}" || exit 1
 
 echo Finished
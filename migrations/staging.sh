@@ -12,7 +12,6 @@ echo source: $source
 
 # Declare arrays
 declare -a volumes
-declare -a paths
 
 # source volume
 volumes=(
@@ -34,56 +33,16 @@ volumes=(
   # qdrant_snapshots
 )
 
-# target path
-paths=(
-  # /data/db/
-  # /var/lib/rabbitmq/
-  # /data/
-  # /import/
-  # /plugins/
-  # /var/lib/grafana/
-  # /prometheus/
-  # /data/loki/
-  /var/lib/postgresql/data/
-  # /opt/airflow/config/
-  # /opt/airflow/logs/
-  # /opt/airflow/plugins/
-  # /sources/
-  # /tmp/tempo/
-  # /qdrant/storage/
-  # /qdrant/snapshots/
-)
-
-# Get the length of the arrays
-volume_length=${#volumes[@]}
-paths_length=${#paths[@]}
-
-# Compare the lengths
-if [ $volume_length -ne $paths_length ]; then
-  echo "diff length! $volume_length $paths_length"
-else
-  # Loop x times
-  for ((i=1; i<=volume_length; i++)); do
-    j=i-1
-    volume=${volumes[$j]}
-    path=${paths[$j]}
-    echo "######################################"
-    echo "######################################"
-    echo "######################################"
-    echo $volume, $path
-    echo "######################################"
-    echo "######################################"
-    echo "######################################"
-
-    echo 1. Downloading...
-    ssh -i "$pem" $source "sudo docker run --rm -v development_$volume:$path ubuntu tar -cvf - -C $path ." > ./backup/$volume.tar
-    
-    echo 2. Migrating...
-    docker run --rm -v compose_$volume:$path -v ./backup:/backup ubuntu bash -c "cd $path && tar -xvf ${pwd}/backup/$volume.tar --strip 1"
-    
-    # echo 3. Deleting .tar
-    # rm ./backup/$volume.tar
-
-    echo 4. Completed
-  done
-fi
\ No newline at end of file
+script_dir="$(cd "$(dirname "$0")" && pwd)"
+
+# Remote volumes are pulled over SSH into ./backup/<volume>/ with rsync and then
+# synced into compose_<volume>. Both steps are incremental, so a rerun only
+# transfers what changed. Requires rsync on the source server; the local pull
+# runs through sudo so the staged files keep their numeric owners; sudo asks for
+# its password once, before the copies start.
+python3 "$script_dir/migrate_volumes.py" \
+  --source-prefix development \
+  --remote "$source" \
+  --pem "$pem" \
+  --staging-dir ./backup \
+  "${volumes[@]}"